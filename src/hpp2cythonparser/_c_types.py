@@ -1,12 +1,15 @@
 # ruff: noqa: N801
 __all__ = [
+    "c_const",
     "c_constructor",
     "c_destructor",
     "c_double",
     "c_generic",
     "c_generic_t",
     "c_int",
+    "c_libcpp",
     "c_ptr",
+    "c_ref",
     "c_struct",
     "c_void",
 ]
@@ -65,6 +68,28 @@ class c_generic_t(Ctype):
         return f"{self.val}[{', '.join(self.args)}]"
 
 
+@dc.dataclass(slots=True)
+class c_libcpp(Ctype):
+    val: Final[str]
+    module: Final[str]
+    args: Final[list[Ctype]] = dc.field(default_factory=list[Ctype])
+
+    def __str__(self) -> str:
+        if self.args:
+            return f"{self.val}[{', '.join(str(a) for a in self.args)}]"
+        return self.val
+
+
+@dc.dataclass(slots=True)
+class c_const(Ctype):
+    kind: Ctype = dc.field(
+        default_factory=c_void,
+    )
+
+    def __str__(self) -> str:
+        return f"const {self.kind}"
+
+
 @dc.dataclass(slots=True)
 class c_ptr(Ctype):
     kind: Ctype = dc.field(
@@ -72,11 +97,24 @@ class c_ptr(Ctype):
     )
     # char: Literal["[]", "*", "[:,:]", "[:,:,:]"] = "*"
     char: str = "*"
+    const: bool = False
 
     def __str__(self) -> str:
+        if self.const:
+            return f"{self.kind}{self.char} const"
         return f"{self.kind}{self.char}"
 
 
+@dc.dataclass(slots=True)
+class c_ref(Ctype):
+    kind: Ctype = dc.field(
+        default_factory=c_void,
+    )
+
+    def __str__(self) -> str:
+        return f"{self.kind}&"
+
+
 @dc.dataclass(slots=True)
 class c_constructor(CtypeExtended):
     val: Final[str] = ""
@@ -1,24 +1,43 @@
 from __future__ import annotations
 
 __all__ = [
-    "export_cython_header",
     "find_includes_from_file",
+    "find_includes_from_lines",
+    "find_libcpp_imports",
     "get_input_info",
+    "parse_cppheader",
     "parse_cppheader_code",
+    "parse_cppheader_lines",
+    "render_cython_header",
 ]
 
 import dataclasses as dc
 from pathlib import Path
+from pprint import pformat
 from typing import TYPE_CHECKING
 
+from hpp2cythonparser._c_types import c_libcpp
+from hpp2cythonparser.struct import CPPClass, CPPFunction, CPPHeader, CPPVar
+
 from . import print_headers as hp
 from .file_parsing import get_item_from_code, parse_include
-from .tools import Braces, get_context, read_cppfile
+from .tools import (
+    Braces,
+    filterline,
+    get_context,
+    log_lazy,
+    read_cpp_preamble,
+    read_cppfile,
+    remove_comment,
+    split_statements,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from pytools.logging.trait import ILogger
 
-    from hpp2cythonparser.struct import CPPClass, CPPFunction, CPPVar
+    from hpp2cythonparser.trait import CtypeExtended
 
 
 @dc.dataclass(slots=True)
@@ -43,17 +62,29 @@ def get_input_info(
     )
     cpp_file = hpp_file.with_suffix(".cpp")
     cython_file = cython_folder / hpp_file.with_suffix(".pxd").name
-    log.info(
-        f"Processing header {hpp_file} with source file",
-        f"  hpp name is {hpp_file.with_suffix('.pxd').name}",
-        f"  {cpp_file}",
-        f"  the cython header will be saved to {cython_file}",
+    log_lazy(
+        log,
+        "info",
+        lambda: f"Processing header {hpp_file} with source file",
+        lambda: f"  hpp name is {hpp_file.with_suffix('.pxd').name}",
+        lambda: f"  {cpp_file}",
+        lambda: f"  the cython header will be saved to {cython_file}",
     )
     return InputInfo(hpp_file, cpp_file, cython_file, cython_folder)
 
 
-def find_includes_from_file(name: Path | str, header: str, folder: Path | str) -> list[str]:
-    code = read_cppfile(name)
+def find_includes_from_file(
+    name: Path | str,
+    header: str,
+    folder: Path | str,
+    *,
+    preamble_only: bool = False,
+) -> list[str]:
+    code = read_cpp_preamble(name) if preamble_only else read_cppfile(name)
+    return find_includes_from_lines(code, header, folder)
+
+
+def find_includes_from_lines(code: list[str], header: str, folder: Path | str) -> list[str]:
     header_lines = [
         parse_include(line, header, folder) for line in code if line.startswith("#include")
     ]
@@ -79,37 +110,104 @@ def get_namespace_from_code(code: str) -> tuple[str | None, str]:
 
 
 def parse_cppheader_code(code: str, log: ILogger) -> list[CPPVar | CPPFunction | CPPClass]:
-    rest = code
     content: list[CPPVar | CPPFunction | CPPClass] = []
-    while rest:
-        item, rest = get_item_from_code(rest, log)
-        if item is not None:
-            content.append(item)
+    for statement in split_statements(code):
+        rest = statement
+        while rest:
+            item, rest = get_item_from_code(rest, log)
+            if item is not None:
+                content.append(item)
     return content
 
 
-def export_cython_header(
+def parse_cppheader_lines(
+    code: list[str],
+    log: ILogger,
+) -> tuple[str | None, list[CPPVar | CPPFunction | CPPClass]]:
+    namespace, raw = get_namespace_from_code(remove_comment(filterline(code, "#include")))
+    return namespace, parse_cppheader_code(raw, log)
+
+
+def parse_cppheader(inp: InputInfo, log: ILogger) -> CPPHeader:
+    includes_cpp = (
+        find_includes_from_file(
+            inp.cpp_file,
+            inp.hpp_file.name,
+            inp.cython_folder,
+            preamble_only=True,
+        )
+        if inp.cpp_file.is_file()
+        else []
+    )
+    includes_hpp = find_includes_from_file(
+        inp.hpp_file,
+        inp.hpp_file.name,
+        inp.cython_folder,
+    )
+    includes = sorted(set(includes_cpp + includes_hpp))
+    namespace, content = parse_cppheader_lines(read_cppfile(inp.hpp_file), log)
+    log_lazy(log, "info", lambda: f"The header name is {namespace}")
+    log_lazy(
+        log,
+        "info",
+        lambda: f"Includes found: {len(includes)} items, ",
+        lambda: pformat(includes),
+    )
+    log_lazy(
+        log,
+        "info",
+        lambda: f"Content found: {len(content)} items, ",
+        lambda: pformat(content),
+        "\n",
+    )
+    return CPPHeader(namespace, includes, content)
+
+
+def _walk_libcpp(kind: CtypeExtended) -> Iterator[tuple[str, str]]:
+    if isinstance(kind, c_libcpp):
+        yield kind.module, kind.val
+        for arg in kind.args:
+            yield from _walk_libcpp(arg)
+    elif (inner := getattr(kind, "kind", None)) is not None:
+        yield from _walk_libcpp(inner)
+
+
+def find_libcpp_imports(content: list[CPPVar | CPPFunction | CPPClass]) -> list[str]:
+    found: set[tuple[str, str]] = set()
+    stack: list[CPPVar | CPPFunction | CPPClass] = list(content)
+    while stack:
+        match stack.pop():
+            case CPPClass(content=members):
+                stack.extend(members)
+            case CPPFunction(kind=kind, content=args):
+                stack.extend(args)
+                found.update(_walk_libcpp(kind))
+            case CPPVar(kind=kind):
+                found.update(_walk_libcpp(kind))
+    return [f"from {module} cimport {name}" for module, name in sorted(found)]
+
+
+def render_cython_header(
     inp: InputInfo,
     includes: list[str],
     namespace: str | None,
     content: list[CPPVar | CPPFunction | CPPClass],
     *,
     show_content: bool,
-) -> None:
-    inp.cython_file.parent.mkdir(parents=True, exist_ok=True)
-    with inp.cython_file.open("w") as fout:
-        fout.write(hp.print_header(inp.hpp_file.stem))
-        for s in includes:
-            fout.write(f"cimport {s}\n")
-        fout.write("\n")
-        if inp.cpp_file.is_file():
-            fout.write(hp.print_cppsrc(inp.cpp_file))
-        fout.write(hp.print_end_src())
-        fout.write(hp.print_headers_guard())
-        fout.write(hp.print_hppsrc_header(inp.hpp_file, namespace))
-        if show_content and (content != []):
-            for c in content:
-                fout.write(str(c))
-                fout.write("\n\n")
-        else:
-            fout.write("  pass")
+) -> str:
+    out = [hp.print_header(inp.hpp_file.stem)]
+    out.extend(f"cimport {s}\n" for s in includes)
+    out.extend(f"{s}\n" for s in find_libcpp_imports(content))
+    out.append("\n")
+    if inp.cpp_file.is_file():
+        out.append(hp.print_cppsrc(inp.cpp_file))
+    out.append(hp.print_end_src())
+    out.append(hp.print_headers_guard())
+    out.append(hp.print_hppsrc_header(inp.hpp_file, namespace))
+    if show_content and (content != []):
+        for c in content:
+            out.append(str(c))
+            out.append("\n\n")
+    else:
+        out.append("  pass")
+    return "".join(out)
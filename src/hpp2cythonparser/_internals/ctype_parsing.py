@@ -2,30 +2,41 @@
 from __future__ import annotations
 
 __all__ = [
+    "apply_declarators",
     "check_next_type",
     "cstrip_prefix",
     "get_variable_type",
+    "split_type_head",
 ]
 
+import dataclasses as dc
+import re
 from typing import TYPE_CHECKING, Literal
 
 from hpp2cythonparser._c_types import (
+    c_const,
     c_double,
     c_generic,
     c_generic_t,
     c_int,
+    c_libcpp,
     c_ptr,
+    c_ref,
     c_struct,
     c_void,
 )
 from hpp2cythonparser.trait import CPPObject, Ctype
 
-from .tools import Braces, get_context
+from .tools import Braces, get_brace_count, get_context, split_toplevel
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
 
+# declaration specifiers that do not change the emitted Cython declaration
+_SPECIFIER = re.compile(r"(?:inline|constexpr|virtual|explicit)\b")
+
+
 def check_next_type(code: str, class_name: str | None = None) -> CPPObject:
     if class_name:
         if code.startswith(class_name):
@@ -34,17 +45,16 @@ def check_next_type(code: str, class_name: str | None = None) -> CPPObject:
             return CPPObject.destructor
     if code.startswith("template"):
         return CPPObject.template
-    if code.startswith("inline"):
+    if _SPECIFIER.match(code):
         return CPPObject.inline
     if code.startswith("typedef"):
         return CPPObject.typedef
     if code.startswith("class"):
         return CPPObject.cls
     colon_stop = code.find(";")
-    func_brace = code.find("(")
     if colon_stop == -1:
         return CPPObject.func
-    if func_brace == -1 or colon_stop < func_brace:
+    if code.find("(", 0, colon_stop) == -1:
         return CPPObject.var
     return CPPObject.func
 
@@ -56,27 +66,84 @@ def cstrip_prefix(
 ) -> str:
     """Strip the prefix from the code."""
     for p in prefix:
-        if code.startswith(p):
+        if re.match(rf"{p}\b", code):
             code = code[len(p) :].strip()
     return code
 
 
+# C++ standard library types and the libcpp module Cython declares them in
+_LIBCPP_TYPES: dict[str, tuple[str, str]] = {
+    "std::vector": ("libcpp.vector", "vector"),
+    "std::string": ("libcpp.string", "string"),
+    "std::map": ("libcpp.map", "map"),
+    "std::unordered_map": ("libcpp.unordered_map", "unordered_map"),
+    "std::set": ("libcpp.set", "set"),
+    "std::unordered_set": ("libcpp.unordered_set", "unordered_set"),
+    "std::deque": ("libcpp.deque", "deque"),
+    "std::list": ("libcpp.list", "list"),
+    "std::pair": ("libcpp.utility", "pair"),
+    "std::complex": ("libcpp.complex", "complex"),
+    "std::optional": ("libcpp.optional", "optional"),
+    "std::unique_ptr": ("libcpp.memory", "unique_ptr"),
+    "std::shared_ptr": ("libcpp.memory", "shared_ptr"),
+    "std::weak_ptr": ("libcpp.memory", "weak_ptr"),
+}
+# fixed width integers from <cstdint>, declared by Cython in libc.stdint
+_STDINT = [f"{u}int{n}_t" for u in ("", "u") for n in (8, 16, 32, 64)] + ["intptr_t", "uintptr_t"]
+_LIBCPP_TYPES.update({name: ("libc.stdint", name) for name in _STDINT})
+_LIBCPP_TYPES.update({f"std::{name}": ("libc.stdint", name) for name in _STDINT})
+
+_BUILTIN_HEAD = re.compile(r"(void|int|double)(?=[*&]|$)")
+
+_DECLARATOR = re.compile(r"\s*(\*|&|const\b)")
+_DECLARATOR_START = re.compile(r"[*&]")
+_TYPE_HEAD_END = re.compile(r"\S*")
+
+
+def apply_declarators(base_type: Ctype, code: str) -> tuple[Ctype, str]:
+    """Apply the leading ``*``, ``&`` and ``const`` of ``code`` to ``base_type``.
+
+    ``const`` qualifies the pointee until a ``*`` has been read, then the pointer.
+    """
+    pos = 0
+    while matched := _DECLARATOR.match(code, pos):
+        match matched.group(1):
+            case "*":
+                base_type = c_ptr(base_type)
+            case "&":
+                base_type = c_ref(base_type)
+            case _ if isinstance(base_type, c_ptr):
+                base_type = dc.replace(base_type, const=True)
+            case _:
+                base_type = c_const(base_type)
+        pos = matched.end()
+    return base_type, code[pos:].strip()
+
+
+_NESTED_NAME = re.compile(r"(?:::\s*\w+\s*)+")
+
+
 def c_generic_split(code: str) -> tuple[Ctype, str]:
     match get_context(code, Braces.angle):
+        case (kind, vars, extras) if nested := _NESTED_NAME.match(extras):
+            # e.g. std::vector<double>::iterator, kept generic so it is never emitted
+            base_type = c_generic_t(kind, split_toplevel(vars))
+            extras = extras[nested.end() :]
+        case (kind, vars, extras) if kind in _LIBCPP_TYPES:
+            module, name = _LIBCPP_TYPES[kind]
+            args = [get_variable_type(v)[0] for v in split_toplevel(vars)]
+            base_type = c_libcpp(name, module, args)
         case (kind, vars, extras):
-            base_type = c_generic_t(kind, [v.strip() for v in vars.split(",")])
+            base_type = c_generic_t(kind, split_toplevel(vars))
         case None:
             msg = f"template variable {code} does not have closing angle brace"
             raise ValueError(msg)
-    while extras.startswith("*"):
-        base_type = c_ptr(base_type)
-        extras = extras[1:].strip()
     return base_type, extras
 
 
 def c_unkown_split(code: str) -> tuple[Ctype, str]:
-    extras = code.split("*")
-    match extras[0]:
+    name = _DECLARATOR_START.split(code, maxsplit=1)[0]
+    match name:
         case "void":
             base_type = c_void()
         case "int":
@@ -85,27 +152,47 @@ def c_unkown_split(code: str) -> tuple[Ctype, str]:
             base_type = c_double()
         case "struct":
             base_type = c_struct()
+        case s if s in _LIBCPP_TYPES:
+            base_type = c_libcpp(_LIBCPP_TYPES[s][1], _LIBCPP_TYPES[s][0])
         case s:
             base_type = c_generic(s)
-    for _ in range(len(extras) - 1):
-        base_type = c_ptr(base_type)
-    return base_type, code
+    return base_type, code[len(name) :]
+
+
+def _match_end(code: str, pos: int) -> int:
+    head = _TYPE_HEAD_END.match(code, pos)
+    return head.end() if head else pos
+
+
+def split_type_head(code: str) -> tuple[str, str]:
+    """Split off the first word of ``code``, keeping ``<...>`` template arguments whole."""
+    end = _match_end(code, 0)
+    start = code.find("<", 0, end)
+    if start != -1:
+        close = get_brace_count(code, opening="<", closing=">", start=start + 1)
+        if close is None:
+            msg = f"template variable {code} does not have closing angle brace"
+            raise ValueError(msg)
+        end = _match_end(code, start + 1 + close)
+    return code[:end], code[end:].strip()
 
 
 def get_variable_type(raw_code: str) -> tuple[Ctype, str]:
-    code = cstrip_prefix(raw_code)
-    head, tail = code.split(None, 1)
-    if head.startswith("void"):
+    code = cstrip_prefix(raw_code.strip(), prefix=("extern",))
+    const = re.match(r"const\b", code) is not None
+    code = cstrip_prefix(code, prefix=("const",))
+    head, tail = split_type_head(code)
+    builtin = _BUILTIN_HEAD.match(head)
+    if builtin and builtin.group(1) == "void":
         base_type, head = c_void(), head[4:]
-    elif head.startswith("int"):
+    elif builtin and builtin.group(1) == "int":
         base_type, head = c_int(), head[3:]
-    elif head.startswith("double"):
+    elif builtin and builtin.group(1) == "double":
         base_type, head = c_double(), head[6:]
     elif "<" in head:
         base_type, head = c_generic_split(head)
     else:
         base_type, head = c_unkown_split(head)
-    while head.startswith("*"):
-        base_type = c_ptr(base_type)
-        head = head[1:].strip()
-    return base_type, tail
+    if const:
+        base_type = c_const(base_type)
+    return apply_declarators(base_type, f"{head} {tail}")
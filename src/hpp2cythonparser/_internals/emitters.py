@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+__all__ = [
+    "EMITTERS",
+    "PxdEmitter",
+    "PyiEmitter",
+    "PyxEmitter",
+    "export_bindings",
+    "get_emitter",
+]
+import dataclasses as dc
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from hpp2cythonparser._c_types import (
+    c_const,
+    c_constructor,
+    c_double,
+    c_generic,
+    c_int,
+    c_ptr,
+    c_ref,
+    c_void,
+)
+from hpp2cythonparser.struct import BindingOptions, CPPClass, CPPFunction, CPPVar
+from hpp2cythonparser.trait import Emitter
+
+from .core import render_cython_header
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from hpp2cythonparser.struct import CPPHeader
+    from hpp2cythonparser.trait import Ctype, CtypeExtended
+
+    from .core import InputInfo
+
+_PY_TYPES = {"int": "int", "double": "float", "void": "None"}
+_NP_DTYPES = {"int": "np.intc", "double": "np.float64"}
+
+
+@dc.dataclass(slots=True)
+class _Arg:
+    name: str
+    decl: str
+    call: str
+    hint: str
+    setup: list[str] = dc.field(default_factory=list[str])
+    teardown: list[str] = dc.field(default_factory=list[str])
+
+
+@dc.dataclass(slots=True)
+class _Wrapped:
+    name: str
+    args: list[_Arg]
+    returns: str | None
+    hint: str
+
+
+def cython_module_name(inp: InputInfo) -> str:
+    return ".".join(Path(os.path.normpath(str(inp.cython_folder / inp.hpp_file.stem))).parts)
+
+
+def _unqualified(kind: Ctype) -> Ctype:
+    return kind.kind if isinstance(kind, c_const) else kind
+
+
+def _wrap_arg(v: CPPVar, scope: str, classes: set[str], options: BindingOptions) -> _Arg | None:
+    kind, name = v.kind, v.name.strip()
+    match kind:
+        case c_int() | c_double() | c_const(c_int() | c_double()):
+            base = _unqualified(kind)
+            return _Arg(name, f"{base} {name}", name, _PY_TYPES[str(base)])
+        case c_ptr(c_int() | c_double() | c_const(c_int() | c_double()) as base):
+            # const pointees become const memoryviews, which accept read-only buffers
+            rule = options.memoryview_for(f"{scope}.{name}")
+            if rule is None:
+                return None
+            # empty arrays have no first element to index, so they are passed as NULL
+            empty = rule.is_empty(name)
+            arg = _Arg(
+                name,
+                f"{base}{rule.spec()} {name}",
+                f"<{base}*>NULL if {empty} else {rule.first_element(name)}",
+                f"npt.NDArray[{_NP_DTYPES[str(_unqualified(base))]}]",
+            )
+            if not rule.contiguous:
+                # C code indexes the pointer densely, so strided data goes through a copy
+                buffer = f"_{name}"
+                contiguous = dc.replace(rule, contiguous=True)
+                arg.setup.append(
+                    f"cdef {base}{contiguous.spec()} {buffer} = None if {empty} else {name}.copy()",
+                )
+                arg.call = f"<{base}*>NULL if {empty} else {rule.first_element(buffer)}"
+                if not isinstance(base, c_const):
+                    arg.teardown.extend(
+                        [f"if {buffer} is not None:", f"    {name}[...] = {buffer}"],
+                    )
+            return arg
+        case c_ptr(c_generic(val) | c_const(c_generic(val))) if val in classes:
+            # Cython lets None through for extension types, which maps to a NULL pointer
+            call = f"<_cpp.{val}*>NULL if {name} is None else {name}._ptr"
+            return _Arg(name, f"{val} {name}", call, f"{val} | None")
+        case (
+            c_generic(val)
+            | c_const(c_generic(val))
+            | c_ref(c_generic(val) | c_const(c_generic(val)))
+        ) if val in classes:
+            return _Arg(name, f"{val} {name} not None", f"{name}._ptr[0]", val)
+        case _:
+            return None
+
+
+def _wrap_return(kind: CtypeExtended) -> tuple[str | None, str] | None:
+    match kind:
+        case c_void() | c_constructor():
+            return None, "None"
+        case c_int() | c_double() | c_const(c_int() | c_double()):
+            base = _unqualified(kind)
+            return str(base), _PY_TYPES[str(base)]
+        case _:
+            return None
+
+
+def _wrap_function(
+    fn: CPPFunction,
+    classes: set[str],
+    options: BindingOptions,
+    owner: str | None = None,
+) -> _Wrapped | None:
+    scope = f"{owner}.{fn.name}" if owner else fn.name
+    args = [_wrap_arg(v, scope, classes, options) for v in fn.content]
+    returns = _wrap_return(fn.kind)
+    if returns is None or any(a is None for a in args):
+        return None
+    return _Wrapped(fn.name, [a for a in args if a is not None], *returns)
+
+
+def _wrap_overloads(
+    overloads: list[CPPFunction],
+    classes: set[str],
+    options: BindingOptions,
+    owner: str | None = None,
+) -> tuple[CPPFunction, _Wrapped] | None:
+    """First overload, in declaration order, that can be wrapped."""
+    for fn in overloads:
+        if (wrapped := _wrap_function(fn, classes, options, owner)) is not None:
+            return fn, wrapped
+    return None
+
+
+def _wrap_constructor(
+    cls: CPPClass,
+    classes: set[str],
+    options: BindingOptions,
+) -> _Wrapped | None:
+    """Constructor to wrap, or None if ``cls`` cannot be built from Python."""
+    if cls.abstract:
+        return None
+    constructors = _overloads(cls.content).pop(cls.name, [])
+    if not constructors:
+        # C++ only provides the implicit default constructor if none is declared
+        return None if cls.declares_constructor else _Wrapped(cls.name, [], None, "None")
+    picked = _wrap_overloads(constructors, classes, options, cls.name)
+    return picked[1] if picked else None
+
+
+def _overloads(
+    items: list[CPPVar | CPPFunction] | list[CPPVar | CPPFunction | CPPClass],
+) -> dict[str, list[CPPFunction]]:
+    """Functions of ``items`` grouped by name, in declaration order."""
+    functions: dict[str, list[CPPFunction]] = {}
+    for fn in items:
+        if isinstance(fn, CPPFunction):
+            functions.setdefault(fn.name, []).append(fn)
+    return functions
+
+
+def _methods(cls: CPPClass) -> dict[str, list[CPPFunction]]:
+    methods = _overloads(cls.content)
+    methods.pop(cls.name, None)
+    return methods
+
+
+def _member_names(var: CPPVar) -> list[str]:
+    return [v.strip() for v in var.name.split(",")]
+
+
+def _print_preamble(name: str) -> str:
+    return f"""\
+# File: {name}
+# distutils: language = c++
+# cython: language_level=3
+
+"""
+
+
+class PxdEmitter(Emitter):
+    def output(self, inp: InputInfo) -> Path:
+        return inp.cython_file
+
+    def render(self, inp: InputInfo, header: CPPHeader, options: BindingOptions) -> str:
+        return render_cython_header(
+            inp,
+            header.includes,
+            header.namespace,
+            options.annotate_content(header.content),
+            show_content=options.show_content,
+        )
+
+
+class PyxEmitter(Emitter):
+    def output(self, inp: InputInfo) -> Path:
+        return inp.cython_file.with_name(f"{inp.hpp_file.stem}_wrapper.pyx")
+
+    def render(self, inp: InputInfo, header: CPPHeader, options: BindingOptions) -> str:
+        out = [
+            _print_preamble(self.output(inp).name),
+            f"cimport {cython_module_name(inp)} as _cpp\n",
+        ]
+        if not options.show_content:
+            return "".join(out)
+        content = options.annotate_content(header.content)
+        classes = {c.name for c in content if isinstance(c, CPPClass)}
+        for c in content:
+            if isinstance(c, CPPClass):
+                out.append(self._render_class(c, classes, options))
+        for name, overloads in _overloads(content).items():
+            out.append(self._render_function(name, overloads, classes, options))
+        return "\n".join(out)
+
+    def _render_function(
+        self,
+        name: str,
+        overloads: list[CPPFunction],
+        classes: set[str],
+        options: BindingOptions,
+        owner: str | None = None,
+    ) -> str:
+        indent = "    " if owner else ""
+        picked = _wrap_overloads(overloads, classes, options, owner)
+        if picked is None:
+            return f"{indent}# not wrapped: {name}\n"
+        fn, wrapped = picked
+        target = "self._ptr" if owner else "_cpp"
+        args = (["self"] if owner else []) + [a.decl for a in wrapped.args]
+        call = f"{target}.{fn.name}({', '.join(a.call for a in wrapped.args)})"
+        body = [line for a in wrapped.args for line in a.setup]
+        teardown = [line for a in wrapped.args for line in a.teardown]
+        if wrapped.returns and (fn.nogil or teardown):
+            body.append(f"cdef {wrapped.returns} _r")
+            call, teardown = f"_r = {call}", [*teardown, "return _r"]
+        elif wrapped.returns:
+            call = f"return {call}"
+        body.extend(["with nogil:", f"    {call}"] if fn.nogil else [call])
+        body.extend(teardown)
+        lines = [f"def {fn.name}({', '.join(args)}):", *[f"    {b}" for b in body]]
+        return "".join(f"{indent}{line}\n" for line in lines)
+
+    def _render_class(self, cls: CPPClass, classes: set[str], options: BindingOptions) -> str:
+        lines = [f"cdef class {cls.name}:", f"    cdef _cpp.{cls.name}* _ptr", ""]
+        wrapped = _wrap_constructor(cls, classes, options)
+        if wrapped is None:
+            # without this the methods below would dereference a NULL _ptr
+            lines.extend(
+                [
+                    f"    # not wrapped: {cls.name} constructor",
+                    "    def __cinit__(self, *args, **kwargs):",
+                    f'        raise TypeError("{cls.name} cannot be constructed from Python")',
+                ],
+            )
+        else:
+            args = ", ".join(["self"] + [a.decl for a in wrapped.args])
+            call = ", ".join(a.call for a in wrapped.args)
+            lines.extend(
+                [
+                    f"    def __cinit__({args}):",
+                    f"        self._ptr = new _cpp.{cls.name}({call})",
+                    "",
+                    "    def __dealloc__(self):",
+                    "        del self._ptr",
+                ],
+            )
+        for var in cls.content:
+            if isinstance(var, CPPVar) and _wrap_return(var.kind) is not None:
+                for name in _member_names(var):
+                    lines.extend(
+                        [
+                            "",
+                            "    @property",
+                            f"    def {name}(self):",
+                            f"        return self._ptr.{name}",
+                        ],
+                    )
+        methods = [
+            self._render_function(name, overloads, classes, options, cls.name)
+            for name, overloads in _methods(cls).items()
+        ]
+        return "\n".join(["\n".join(lines) + "\n", *methods])
+
+
+class PyiEmitter(Emitter):
+    def output(self, inp: InputInfo) -> Path:
+        return inp.cython_file.with_name(f"{inp.hpp_file.stem}_wrapper.pyi")
+
+    def render(self, inp: InputInfo, header: CPPHeader, options: BindingOptions) -> str:
+        out = [
+            f"# File: {self.output(inp).name}\nimport numpy as np\nimport numpy.typing as npt\n",
+        ]
+        if not options.show_content:
+            return "".join(out)
+        classes = {c.name for c in header.content if isinstance(c, CPPClass)}
+        for c in header.content:
+            if isinstance(c, CPPClass):
+                out.append(self._render_class(c, classes, options))
+        for overloads in _overloads(header.content).values():
+            if (picked := _wrap_overloads(overloads, classes, options)) is not None:
+                out.append(self._render_function(picked[1]))
+        return "\n".join(out)
+
+    def _render_function(self, wrapped: _Wrapped, *, method: bool = False) -> str:
+        args = (["self"] if method else []) + [f"{a.name}: {a.hint}" for a in wrapped.args]
+        text = f"def {wrapped.name}({', '.join(args)}) -> {wrapped.hint}: ...\n"
+        return "    " + text if method else text
+
+    def _render_class(self, cls: CPPClass, classes: set[str], options: BindingOptions) -> str:
+        lines = [f"class {cls.name}:"]
+        if (constructor := _wrap_constructor(cls, classes, options)) is not None:
+            constructor.name = "__init__"
+            lines.append(self._render_function(constructor, method=True).rstrip("\n"))
+        for overloads in _methods(cls).values():
+            if (picked := _wrap_overloads(overloads, classes, options, cls.name)) is not None:
+                lines.append(self._render_function(picked[1], method=True).rstrip("\n"))
+        for var in cls.content:
+            if isinstance(var, CPPVar) and (returns := _wrap_return(var.kind)) is not None:
+                for name in _member_names(var):
+                    lines.extend(["    @property", f"    def {name}(self) -> {returns[1]}: ..."])
+        if len(lines) == 1:
+            lines.append("    ...")
+        return "\n".join(lines) + "\n"
+
+
+EMITTERS: dict[str, type[Emitter]] = {
+    "pxd": PxdEmitter,
+    "pyx": PyxEmitter,
+    "pyi": PyiEmitter,
+}
+
+
+def get_emitter(emitter: str | Emitter) -> Emitter:
+    if isinstance(emitter, Emitter):
+        return emitter
+    if emitter not in EMITTERS:
+        msg = f">>>ERROR: unknown emitter {emitter}, expected one of {sorted(EMITTERS)}"
+        raise ValueError(msg)
+    return EMITTERS[emitter]()
+
+
+def export_bindings(
+    inp: InputInfo,
+    header: CPPHeader,
+    emitters: Sequence[str | Emitter],
+    options: BindingOptions,
+) -> list[Path]:
+    written: list[Path] = []
+    for emitter in [get_emitter(e) for e in emitters]:
+        name = emitter.output(inp)
+        name.parent.mkdir(parents=True, exist_ok=True)
+        name.write_text(emitter.render(inp, header, options))
+        written.append(name)
+    return written
@@ -13,7 +13,10 @@ __all__ = [
     "get_typedef_instance",
     "get_variable_instance",
     "parse_include",
+    "split_class_members",
     "split_function_arguments",
+    "split_function_qualifiers",
+    "split_pure_specifier",
     "valid_function_arg",
 ]
 import os
@@ -22,12 +25,15 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from hpp2cythonparser._c_types import (
+    c_const,
     c_constructor,
     c_double,
     c_generic,
     c_generic_t,
     c_int,
+    c_libcpp,
     c_ptr,
+    c_ref,
     c_struct,
     c_void,
 )
@@ -35,9 +41,19 @@ from hpp2cythonparser.struct import CPPClass, CPPFunction, CPPVar
 from hpp2cythonparser.trait import CPPObject, Ctype
 
 from .ctype_parsing import check_next_type, get_variable_type
-from .tools import Braces, check_for_semicolon, get_context
+from .tools import (
+    Braces,
+    check_for_semicolon,
+    get_context,
+    log_lazy,
+    skip_braced,
+    split_statements,
+    split_toplevel,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from pytools.logging.trait import ILogger
 
 _INCLUDE_SIZE = 2
@@ -71,14 +87,20 @@ def get_variable_instance(code: str, *, nested: bool = False) -> tuple[CPPVar |
     v_list = [v.split("=")[0] for v in vs]
     v_list = [v.split("[")[0] for v in v_list]
     match kind:
-        case c_generic_t():
+        case c_generic_t() | c_const(c_generic_t()):
             var = None
-        case c_generic():
+        case c_generic() | c_const(c_generic()):
             var = None
-        case c_struct():
+        case c_struct() | c_const(c_struct()):
             var = None
         case c_ptr(c_generic_t() | c_generic() | c_struct()):
             var = None
+        case c_ptr(c_const(c_generic_t() | c_generic() | c_struct())):
+            var = None
+        case c_ref(c_generic_t() | c_generic() | c_struct()):
+            var = None
+        case c_ref(c_const(c_generic_t() | c_generic() | c_struct())):
+            var = None
         case _:
             var = CPPVar(kind, ", ".join(v_list), nested)
     return var, rest if rest else None
@@ -94,24 +116,87 @@ def format_function_argvar(code: str, *, subelem: bool) -> CPPVar:
 
 
 def split_function_arguments(code: str, *, subelem: bool = False) -> list[CPPVar]:
-    vs = [v.strip() for v in code.split(",")]
-    return [format_function_argvar(v, subelem=subelem) for v in vs]
+    return [format_function_argvar(v, subelem=subelem) for v in split_toplevel(code)]
 
 
-def find_function_ending(code: str) -> str:
-    function_seperator = re.compile(r";|{};|{}|{\s+};|{\s+}")
-    matched_obj = function_seperator.search(code)
-    if matched_obj is None:
-        msg = f">>>ERROR: cannot find function ending in code: {code}"
-        raise ValueError(msg)
-    return code[matched_obj.end() :].strip()
+_FUNCTION_QUALIFIER = re.compile(r"(const|noexcept|override|final)\b\s*(?:\(\s*(\w*)\s*\))?\s*")
 
 
-def get_function_instance(code: str, *, nested: bool = False) -> tuple[CPPFunction, str | None]:
+def split_function_qualifiers(code: str) -> tuple[set[str], str]:
+    """Consume the qualifiers after a function's argument list, e.g. ``noexcept``."""
+    found: set[str] = set()
+    pos = 0
+    while matched := _FUNCTION_QUALIFIER.match(code, pos):
+        if matched.group(2) != "false":
+            found.add(matched.group(1))
+        pos = matched.end()
+    return found, code[pos:]
+
+
+_PURE_SPECIFIER = re.compile(r"=\s*(0|default|delete)\s*")
+_INITIALIZER_TOKEN = re.compile(r"[(){]")
+_INITIALIZER_END = re.compile(r"[)}]\s*$")
+
+
+def _skip_initializer_list(code: str, pos: int) -> int:
+    """Position of the body ``{`` after a constructor's ``: a(x), b{y}`` list."""
+    depth = 0
+    while matched := _INITIALIZER_TOKEN.search(code, pos):
+        match matched.group():
+            case "(":
+                depth = depth + 1
+            case ")":
+                depth = depth - 1
+            case _ if depth == 0 and _INITIALIZER_END.search(code, 0, matched.start()):
+                return matched.start()
+            case _:
+                pos = skip_braced(code, matched.start())
+                continue
+        pos = matched.end()
+    msg = f">>>ERROR: cannot find constructor body in code: {code}"
+    raise ValueError(msg)
+
+
+def split_pure_specifier(code: str) -> tuple[str | None, str]:
+    """Consume the ``= 0``, ``= default`` or ``= delete`` after a function's qualifiers."""
+    code = code.strip()
+    if matched := _PURE_SPECIFIER.match(code):
+        return matched.group(1), code[matched.end() :]
+    return None, code
+
+
+def find_function_ending(code: str) -> str:
+    code = code.strip()
+    pos = _skip_initializer_list(code, 1) if code.startswith(":") else 0
+    if code.startswith("{", pos):
+        pos = skip_braced(code, pos)
+        return check_for_semicolon(code[pos:])
+    if code.startswith(";", pos):
+        return code[pos + 1 :].strip()
+    msg = f">>>ERROR: cannot find function ending in code: {code}"
+    raise ValueError(msg)
+
+
+def get_function_instance(
+    code: str,
+    *,
+    nested: bool = False,
+) -> tuple[CPPFunction | None, str | None]:
     kind, rest = get_variable_type(code)
     match get_context(rest, Braces.round):
         case (name, context, tail):
-            fn = CPPFunction(kind, name, _subelem=nested)
+            qualifiers, tail = split_function_qualifiers(tail)
+            specifier, tail = split_pure_specifier(tail)
+            if specifier == "delete":
+                return None, find_function_ending(tail)
+            fn = CPPFunction(
+                kind,
+                name,
+                _subelem=nested,
+                noexcept="noexcept" in qualifiers,
+                const="const" in qualifiers,
+                pure=specifier == "0",
+            )
             if context:
                 vs = split_function_arguments(context, subelem=True)
                 fn.content.extend(vs)
@@ -126,7 +211,7 @@ def get_constructor(
     class_name: str | None,
     *,
     nested: bool = False,
-) -> tuple[CPPFunction, str | None]:
+) -> tuple[CPPFunction | None, str | None]:
     match get_context(code, Braces.round):
         case (name, context, tail):
             if class_name is None:
@@ -135,6 +220,10 @@ def get_constructor(
             if class_name != name:
                 msg = f">>>ERROR: class name {class_name} does not match function name {name}"
                 raise ValueError(msg)
+            _, tail = split_function_qualifiers(tail)
+            specifier, tail = split_pure_specifier(tail)
+            if specifier == "delete":
+                return None, find_function_ending(tail)
             fn = CPPFunction(c_constructor(), class_name, _subelem=nested)
             if context:
                 vs = split_function_arguments(context, subelem=True)
@@ -148,26 +237,39 @@ def get_constructor(
 def get_destructor(code: str) -> tuple[None, str | None]:
     match get_context(code, Braces.round):
         case (_, _, tail):
+            _, tail = split_function_qualifiers(tail)
+            _, tail = split_pure_specifier(tail)
             return None, find_function_ending(tail)
         case None:
             msg = f">>>ERROR: destructor code does not have call braces: {code}"
             raise ValueError(msg)
 
 
+_ACCESS_LABEL = re.compile(r"(public|private|protected)\s*:(?!:)\s*")
+# a member declared ``= 0`` after its argument list and qualifiers
+_PURE_VIRTUAL = re.compile(
+    r"\)\s*(?:(?:const|noexcept|override|final)\b\s*(?:\([^)]*\)\s*)?)*=\s*0\s*;?$",
+)
+
+
+def split_class_members(code: str) -> Iterator[tuple[str, str]]:
+    """Yield the statements of a class body with the access they are declared under.
+
+    Only labels at the start of a top level statement count, not names inside bodies.
+    """
+    access = "private"
+    for statement in split_statements(code):
+        pos = 0
+        while label := _ACCESS_LABEL.match(statement, pos):
+            access = label.group(1)
+            pos = label.end()
+        if rest := statement[pos:]:
+            yield access, rest
+
+
 def get_classmembers_public(code: str) -> str | None:
-    start = code.find("public")
-    if start < 0:
-        return None
-    rest = code[start + 6 :].strip()
-    start = rest.find(":")
-    rest = rest[start + 1 :].strip()
-    end = rest.find("private")
-    if end > 0:
-        return rest[:end]
-    end = rest.find("protected")
-    if end > 0:
-        return rest[:end]
-    return rest
+    public = [s for access, s in split_class_members(code) if access == "public"]
+    return " ".join(public) if public else None
 
 
 def get_class_instance(code: str, log: ILogger) -> tuple[CPPClass, str | None]:
@@ -179,11 +281,19 @@ def get_class_instance(code: str, log: ILogger) -> tuple[CPPClass, str | None]:
         raise ValueError(msg)
     item = CPPClass(name)
     _, context, tail = content
-    context = get_classmembers_public(context)
-    while context:
-        members, context = get_item_from_code(context, log, name, nested=True)
-        if isinstance(members, CPPVar | CPPFunction):
-            item.content.append(members)
+    constructor = re.compile(rf"(?:(?:inline|constexpr|explicit)\s+)*{re.escape(name)}\s*\(")
+    for access, statement in split_class_members(context):
+        if _PURE_VIRTUAL.search(statement):
+            item.abstract = True
+        if constructor.match(statement):
+            item.declares_constructor = True
+        if access != "public":
+            continue
+        rest = statement
+        while rest:
+            members, rest = get_item_from_code(rest, log, name, nested=True)
+            if isinstance(members, CPPVar | CPPFunction):
+                item.content.append(members)
     tail = check_for_semicolon(tail)
     if tail:
         return item, tail
@@ -195,10 +305,15 @@ def get_typedef_instance(code: str) -> tuple[None, str | None]:
     return None, code[first + 1 :].strip()
 
 
-def get_inline_instance(code: str, log: ILogger) -> tuple[None, str | None]:
+def get_inline_instance(
+    code: str,
+    log: ILogger,
+    class_name: str | None = None,
+    *,
+    nested: bool = False,
+) -> tuple[CPPVar | CPPFunction | CPPClass | None, str | None]:
     _, rest = code.split(None, 1)
-    _, tail = get_item_from_code(rest, log)
-    return None, tail
+    return get_item_from_code(rest, log, class_name, nested=nested)
 
 
 def get_template_instance(code: str, log: ILogger) -> tuple[None, str | None]:
@@ -215,8 +330,13 @@ def get_template_instance(code: str, log: ILogger) -> tuple[None, str | None]:
 
 def valid_function_arg(v_type: Ctype, log: ILogger) -> bool:
     match v_type:
-        case c_ptr():
-            valid_function_arg(v_type.kind, log)
+        case c_ref(c_ref()):
+            log.warn(">>>>WARNING: rvalue reference in function args, ignored")
+            return False
+        case c_ptr() | c_const() | c_ref():
+            return valid_function_arg(v_type.kind, log)
+        case c_libcpp():
+            return all(valid_function_arg(a, log) for a in v_type.args)
         case c_void() | c_int() | c_double() | c_generic():
             pass
         case c_struct():
@@ -226,12 +346,14 @@ def valid_function_arg(v_type: Ctype, log: ILogger) -> bool:
             log.warn(">>>>WARNING: generic type in function args, ignored")
             return False
         case _:
-            log.warn(f">>>>WARNING: inadmissible type {v_type}, ignored")
+            log_lazy(log, "warn", lambda: f">>>>WARNING: inadmissible type {v_type}, ignored")
             return False
     return True
 
 
 def function_arg_check(fn: CPPFunction, log: ILogger) -> CPPFunction | None:
+    if isinstance(fn.kind, Ctype) and not valid_function_arg(fn.kind, log):
+        return None
     for v in fn.content:
         if not valid_function_arg(v.kind, log):
             return None
@@ -253,10 +375,10 @@ def get_item_from_code(
             kind, rest = get_variable_instance(code, nested=nested)
         case CPPObject.func:
             member, rest = get_function_instance(code, nested=nested)
-            kind = function_arg_check(member, log)
+            kind = function_arg_check(member, log) if member else None
         case CPPObject.constructor:
             member, rest = get_constructor(code, class_name, nested=nested)
-            kind = function_arg_check(member, log)
+            kind = function_arg_check(member, log) if member else None
         case CPPObject.destructor:
             kind, rest = get_destructor(code)
         case CPPObject.typedef:
@@ -264,7 +386,7 @@ def get_item_from_code(
         case CPPObject.template:
             kind, rest = get_template_instance(code, log)
         case CPPObject.inline:
-            kind, rest = get_inline_instance(code, log)
+            kind, rest = get_inline_instance(code, log, class_name, nested=nested)
         case _:
             log.error(code)
             raise NotImplementedError
@@ -3,15 +3,30 @@ from __future__ import annotations
 __all__ = [
     "Braces",
     "check_for_semicolon",
+    "clean_cpplines",
     "filterline",
     "get_brace_count",
     "get_context",
+    "log_lazy",
+    "read_cpp_preamble",
     "read_cppfile",
     "remove_comment",
+    "skip_braced",
+    "split_statements",
+    "split_toplevel",
 ]
 import enum
+import functools
+import re
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
+
+from pytools.logging.api import NULL_LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from pytools.logging.trait import ILogger
 
 
 class Braces(enum.Enum):
@@ -22,69 +37,255 @@ class Braces(enum.Enum):
     angle = ("<", ">", 1)
 
 
+def log_lazy(
+    log: ILogger,
+    level: Literal["debug", "info", "warn", "error"],
+    *msg: str | Callable[[], object],
+) -> None:
+    """Emit ``msg`` to ``log``, rendering callables only if ``log`` is not ``NULL_LOGGER``.
+
+    The level is not checked: a real logger set above ``level`` still pays for
+    rendering, only ``NULL_LOGGER`` skips it.
+    """
+    if log is NULL_LOGGER:
+        return
+    getattr(log, level)(*[m if isinstance(m, str) else str(m()) for m in msg])
+
+
 def check_for_semicolon(code: str) -> str:
     if code.startswith(";"):
         return code[1:].strip()
     return code.strip()
 
 
+# string and character literals, matched so that braces inside them are skipped
+_LITERAL = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+
+
+@functools.cache
+def _brace_pattern(opening: str, closing: str) -> re.Pattern[str]:
+    braces = f"{re.escape(opening)}|{re.escape(closing)}"
+    if opening == Braces.comment.value[0]:
+        return re.compile(braces)
+    return re.compile(f"{braces}|{_LITERAL}")
+
+
 def get_brace_count(
     data: str,
     init_count: int = 1,
     opening: Literal["(", "[", "{", "<", "/*"] = "{",
     closing: Literal[")", "]", "}", ">", "*/"] = "}",
+    start: int = 0,
 ) -> int | None:
+    """Offset from ``start`` of the closing brace that balances ``init_count``."""
     count = init_count
-    for i, c in enumerate(data):
-        if c == opening:
-            count = count + 1
-        elif c == closing:
-            count = count - 1
+    for m in _brace_pattern(opening, closing).finditer(data, start):
+        match m.group():
+            case token if token == opening:
+                count = count + 1
+            case token if token == closing:
+                count = count - 1
+            case _:
+                continue
         if count == 0:
-            return i
+            return m.start() - start
     return None
 
 
+def skip_braced(code: str, start: int) -> int:
+    """Index just past the ``{...}`` block opening at ``start``, in one linear pass."""
+    end = get_brace_count(code, start=start + 1)
+    if end is None:
+        msg = f">>>ERROR: end of context {{ not found in {code[start:]=}"
+        raise ValueError(msg)
+    return start + 1 + end + 1
+
+
 def get_context(data: str, brace: Braces) -> tuple[str, str, str] | None:
     left, right, n = brace.value
     start = data.find(left)
     if start == -1:
         return None
-    end = get_brace_count(data[start + 1 :], opening=left, closing=right)
+    end = get_brace_count(data, opening=left, closing=right, start=start + n)
     if end is None:
         msg = f">>>ERROR: end of context {left} not found in {data=}"
         raise ValueError(msg)
+    end = start + n + end
     return (
         data[:start].strip(),
-        data[start + n : start + n + end].strip(),
-        data[start + n + end + n :].strip(),
+        data[start + n : end].strip(),
+        data[end + n :].strip(),
     )
 
 
+_STATEMENT_DELIMITERS = re.compile(rf"[;{{}}()]|{_LITERAL}")
+_TRAILING_SEMICOLON = re.compile(r"\s*;")
+# a brace initialized member directly in a constructor's initializer list
+_BRACE_INIT_CONTINUES = re.compile(r"\s*[,{]")
+
+
+def split_statements(code: str) -> Iterator[str]:
+    """Yield the top level statements of ``code`` in a single pass.
+
+    Braces and semicolons inside parentheses, e.g. ``v_(std::vector<int>{1, 2})``
+    or a lambda default argument, never end a statement.
+    """
+    depth = 0
+    parens = 0
+    pos = 0
+    for m in _STATEMENT_DELIMITERS.finditer(code):
+        match m.group():
+            case "(":
+                parens = parens + 1
+                continue
+            case ")":
+                parens = max(parens - 1, 0)
+                continue
+            case _ if parens:
+                continue
+            case "{":
+                depth = depth + 1
+                continue
+            case "}":
+                depth = depth - 1
+                if depth:
+                    continue
+                if _BRACE_INIT_CONTINUES.match(code, m.end()):
+                    continue
+                end = m.end()
+                if trailing := _TRAILING_SEMICOLON.match(code, end):
+                    end = trailing.end()
+            case ";":
+                if depth:
+                    continue
+                end = m.end()
+            case _:
+                continue
+        if end <= pos:
+            continue
+        if statement := code[pos:end].strip():
+            yield statement
+        pos = end
+    if rest := code[pos:].strip():
+        yield rest
+
+
+_NESTING = re.compile(r"[<(\[{]|[>)\]}]|,")
+
+
+def split_toplevel(code: str) -> list[str]:
+    """Split ``code`` on commas that are not nested in any kind of brace."""
+    parts: list[str] = []
+    depth = 0
+    pos = 0
+    for m in _NESTING.finditer(code):
+        match m.group():
+            case ",":
+                if depth == 0:
+                    parts.append(code[pos : m.start()].strip())
+                    pos = m.end()
+            case "<" | "(" | "[" | "{":
+                depth = depth + 1
+            case _:
+                depth = depth - 1
+    parts.append(code[pos:].strip())
+    return parts
+
+
 def read_cppfile(name: Path | str) -> list[str]:
     name = Path(name)
     if not name.is_file():
         msg = f">>>ERROR: file {name} does not exist"
         raise ValueError(msg)
     with name.open("r") as fin:
-        file = fin.read().split("\n")
-    if file[0].startswith("#pragma"):
+        return clean_cpplines(fin.read().split("\n"))
+
+
+def clean_cpplines(file: list[str]) -> list[str]:
+    if file and file[0].startswith("#pragma"):
         file = file[1:]
     file = [line for line in file if not (line.startswith("#define"))]
     file = [line.split("//")[0].strip() for line in file]
     return [line for line in file if line]
 
 
+_CONDITIONAL_OPEN = frozenset(("if", "ifdef", "ifndef"))
+
+
+def _strip_line_comment(line: str) -> tuple[str, bool]:
+    """Remove comments from ``line``, flagging an unterminated ``/*``."""
+    out: list[str] = []
+    pos = 0
+    while True:
+        block = line.find("/*", pos)
+        inline = line.find("//", pos)
+        if inline != -1 and (block == -1 or inline < block):
+            out.append(line[pos:inline])
+            return " ".join(out).strip(), False
+        if block == -1:
+            out.append(line[pos:])
+            return " ".join(out).strip(), False
+        out.append(line[pos:block])
+        end = line.find("*/", block + 2)
+        if end == -1:
+            return " ".join(out).strip(), True
+        pos = end + 2
+
+
+def read_cpp_preamble(name: Path | str) -> list[str]:
+    """Stream the preprocessor lines of ``name`` up to its first top level declaration."""
+    name = Path(name)
+    if not name.is_file():
+        msg = f">>>ERROR: file {name} does not exist"
+        raise ValueError(msg)
+    preamble: list[str] = []
+    depth = 0
+    in_comment = False
+    continued = False
+    with name.open("r") as fin:
+        for raw in fin:
+            line = raw.strip()
+            if continued:
+                continued = line.endswith("\\")
+                continue
+            if in_comment:
+                end = line.find("*/")
+                if end == -1:
+                    continue
+                line = line[end + 2 :]
+            line, in_comment = _strip_line_comment(line)
+            if not line:
+                continue
+            if not line.startswith("#"):
+                if depth == 0:
+                    break
+                continue
+            continued = line.endswith("\\")
+            directive = line[1:].split(None, 1)
+            match directive[0] if directive else "":
+                case d if d in _CONDITIONAL_OPEN:
+                    depth = depth + 1
+                case "endif":
+                    depth = max(depth - 1, 0)
+            preamble.append(line)
+    return preamble
+
+
 def filterline(code: list[str], word: str) -> list[str]:
     return [line for line in code if not line.startswith(word)]
 
 
 def remove_comment(file: list[str]) -> str:
     raw = " ".join(file)
-    while True:
-        match get_context(raw, Braces.comment):
-            case str(head), str(), str(tail):
-                raw = f"{head} {tail}"
-            case None:
-                break
-    return raw
+    left, right, n = Braces.comment.value
+    pieces: list[str] = []
+    pos = 0
+    while (start := raw.find(left, pos)) != -1:
+        end = raw.find(right, start + n)
+        if end == -1:
+            msg = f">>>ERROR: end of context {left} not found in {raw[start:]=}"
+            raise ValueError(msg)
+        pieces.append(raw[pos:start])
+        pos = end + n
+    pieces.append(raw[pos:])
+    return " ".join(pieces)
@@ -1,23 +1,38 @@
 from __future__ import annotations
 
-__all__ = ["create_cython_header"]
-from pprint import pformat
+__all__ = [
+    "AnnotationRule",
+    "BindingOptions",
+    "MemoryviewRule",
+    "create_cython_bindings",
+    "create_cython_header",
+    "parse_cpp_header",
+]
+import dataclasses as dc
 from typing import TYPE_CHECKING
 
 from pytools.logging.api import NULL_LOGGER, ILogger
 
-from ._internals.core import (
-    export_cython_header,
-    find_includes_from_file,
-    get_input_info,
-    get_namespace_from_code,
-    parse_cppheader_code,
-)
-from ._internals.tools import filterline, read_cppfile, remove_comment
+from ._internals.core import get_input_info, parse_cppheader
+from ._internals.emitters import export_bindings
+from .struct import AnnotationRule, BindingOptions, MemoryviewRule
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from pathlib import Path
 
+    from .struct import CPPHeader
+    from .trait import Emitter
+
+
+def parse_cpp_header(
+    file_name: Path | str,
+    cpp_home: Path | str | None = None,
+    cython_home: Path | str | None = None,
+    log: ILogger = NULL_LOGGER,
+) -> CPPHeader:
+    return parse_cppheader(get_input_info(file_name, log, cpp_home, cython_home), log)
+
 
 def create_cython_header(
     file_name: Path | str,
@@ -25,33 +40,26 @@ def create_cython_header(
     cython_home: Path | str | None = None,
     log: ILogger = NULL_LOGGER,
     *,
-    show_content: bool = True,
+    show_content: bool | None = None,
+    options: BindingOptions | None = None,
 ) -> None:
     inp = get_input_info(file_name, log, cpp_home, cython_home)
+    header = parse_cppheader(inp, log)
+    options = options or BindingOptions()
+    if show_content is not None:
+        options = dc.replace(options, show_content=show_content)
+    export_bindings(inp, header, ["pxd"], options)
 
-    includes_cpp = (
-        find_includes_from_file(inp.cpp_file, inp.hpp_file.name, inp.cython_folder)
-        if inp.cpp_file.is_file()
-        else []
-    )
-    includes_hpp = find_includes_from_file(
-        inp.hpp_file,
-        inp.hpp_file.name,
-        inp.cython_folder,
-    )
-    includes = sorted(set(includes_cpp + includes_hpp))
-    namespace, code = get_namespace_from_code(
-        remove_comment(filterline(read_cppfile(inp.hpp_file), "#include")),
-    )
-    content = parse_cppheader_code(code, log)
-    log.info(f"The header name is {namespace}")
-    log.info(
-        f"Includes found: {len(includes)} items, ",
-        pformat(includes),
-    )
-    log.info(
-        f"Content found: {len(content)} items, ",
-        pformat(content),
-        "\n",
-    )
-    export_cython_header(inp, includes, namespace, content, show_content=show_content)
+
+def create_cython_bindings(
+    file_name: Path | str,
+    cpp_home: Path | str | None = None,
+    cython_home: Path | str | None = None,
+    log: ILogger = NULL_LOGGER,
+    *,
+    emitters: Sequence[str | Emitter] = ("pxd", "pyx", "pyi"),
+    options: BindingOptions | None = None,
+) -> list[Path]:
+    inp = get_input_info(file_name, log, cpp_home, cython_home)
+    header = parse_cppheader(inp, log)
+    return export_bindings(inp, header, emitters, options or BindingOptions())
@@ -1,9 +1,20 @@
-__all__ = ["create_cython_header"]
+__all__ = [
+    "AnnotationRule",
+    "BindingOptions",
+    "MemoryviewRule",
+    "create_cython_bindings",
+    "create_cython_header",
+    "parse_cpp_header",
+]
+from collections.abc import Sequence
 from pathlib import Path
 from typing import overload
 
 from pytools.logging.trait import ILogger
 
+from .struct import AnnotationRule, BindingOptions, CPPHeader, MemoryviewRule
+from .trait import Emitter
+
 @overload
 def create_cython_header(
     file_name: Path | str,
@@ -11,7 +22,8 @@ def create_cython_header(
     cython_home: Path | str,
     log: ILogger = ...,
     *,
-    show_content: bool = True,
+    show_content: bool | None = None,
+    options: BindingOptions | None = None,
 ) -> None: ...
 @overload
 def create_cython_header(
@@ -20,5 +32,40 @@ def create_cython_header(
     cython_home: None = None,
     log: ILogger = ...,
     *,
-    show_content: bool = True,
+    show_content: bool | None = None,
+    options: BindingOptions | None = None,
 ) -> None: ...
+@overload
+def parse_cpp_header(
+    file_name: Path | str,
+    cpp_home: Path | str,
+    cython_home: Path | str,
+    log: ILogger = ...,
+) -> CPPHeader: ...
+@overload
+def parse_cpp_header(
+    file_name: Path | str,
+    cpp_home: None = None,
+    cython_home: None = None,
+    log: ILogger = ...,
+) -> CPPHeader: ...
+@overload
+def create_cython_bindings(
+    file_name: Path | str,
+    cpp_home: Path | str,
+    cython_home: Path | str,
+    log: ILogger = ...,
+    *,
+    emitters: Sequence[str | Emitter] = ...,
+    options: BindingOptions | None = None,
+) -> list[Path]: ...
+@overload
+def create_cython_bindings(
+    file_name: Path | str,
+    cpp_home: None = None,
+    cython_home: None = None,
+    log: ILogger = ...,
+    *,
+    emitters: Sequence[str | Emitter] = ...,
+    options: BindingOptions | None = None,
+) -> list[Path]: ...
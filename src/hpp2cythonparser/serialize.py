@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+__all__ = [
+    "SCHEMA",
+    "SCHEMA_VERSION",
+    "dumps_binary",
+    "dumps_json",
+    "from_dict",
+    "load_ir",
+    "loads_binary",
+    "loads_json",
+    "save_ir",
+    "to_dict",
+]
+import dataclasses as dc
+import json
+from pathlib import Path
+from typing import Any
+
+from . import _c_types
+from .struct import CPPClass, CPPFunction, CPPHeader, CPPVar
+
+SCHEMA = "hpp2cythonparser.ir"
+SCHEMA_VERSION = 1
+
+_NODES: dict[str, type] = {
+    **{name: getattr(_c_types, name) for name in _c_types.__all__},
+    "CPPVar": CPPVar,
+    "CPPFunction": CPPFunction,
+    "CPPClass": CPPClass,
+}
+
+
+def _is_default(field: dc.Field[Any], value: object) -> bool:
+    if field.default is not dc.MISSING:
+        return value == field.default
+    if field.default_factory is not dc.MISSING:
+        return value == field.default_factory()
+    return False
+
+
+def _encode(obj: object) -> Any:
+    match obj:
+        case None | bool() | int() | str():
+            return obj
+        case list():
+            return [_encode(v) for v in obj]
+        case _ if type(obj).__name__ in _NODES:
+            node: dict[str, Any] = {"t": type(obj).__name__}
+            for field in dc.fields(obj):  # type: ignore[arg-type]
+                value = getattr(obj, field.name)
+                if not _is_default(field, value):
+                    node[field.name] = _encode(value)
+            return node
+        case _:
+            msg = f">>>ERROR: cannot serialize object of type {type(obj).__name__}"
+            raise TypeError(msg)
+
+
+def _decode(data: Any) -> Any:
+    match data:
+        case list():
+            return [_decode(v) for v in data]
+        case {"t": str(tag), **fields}:
+            if tag not in _NODES:
+                msg = f">>>ERROR: unknown node type {tag} in IR"
+                raise ValueError(msg)
+            return _NODES[tag](**{k: _decode(v) for k, v in fields.items()})
+        case _:
+            return data
+
+
+def to_dict(header: CPPHeader) -> dict[str, Any]:
+    return {
+        "schema": SCHEMA,
+        "version": SCHEMA_VERSION,
+        "namespace": header.namespace,
+        "includes": list(header.includes),
+        "content": _encode(header.content),
+    }
+
+
+def from_dict(data: dict[str, Any]) -> CPPHeader:
+    if data.get("schema") != SCHEMA:
+        msg = f">>>ERROR: not a {SCHEMA} document"
+        raise ValueError(msg)
+    if data.get("version") != SCHEMA_VERSION:
+        msg = f">>>ERROR: IR version {data.get('version')} is not {SCHEMA_VERSION}"
+        raise ValueError(msg)
+    return CPPHeader(data["namespace"], list(data["includes"]), _decode(data["content"]))
+
+
+def dumps_json(header: CPPHeader, *, indent: int | None = None) -> str:
+    separators = None if indent else (",", ":")
+    return json.dumps(to_dict(header), indent=indent, separators=separators)
+
+
+def loads_json(text: str | bytes) -> CPPHeader:
+    return from_dict(json.loads(text))
+
+
+# Binary layout: magic, then a string table, then one tagged value.
+# Strings (including dict keys) are stored once and referenced by index;
+# all lengths and indices are LEB128 varints.
+_MAGIC = b"H2CIR"
+_NONE, _FALSE, _TRUE, _STR, _LIST, _DICT, _INT = range(7)
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:  # noqa: PLR2004
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos = pos + 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:  # noqa: PLR2004
+            return n, pos
+        shift += 7
+
+
+def _pack(value: Any, out: bytearray, strings: dict[str, int]) -> None:
+    match value:
+        case None:
+            out.append(_NONE)
+        case bool():
+            out.append(_TRUE if value else _FALSE)
+        case int():
+            out.append(_INT)
+            _write_varint(out, (value << 1) ^ (value >> 63))
+        case str():
+            out.append(_STR)
+            _write_varint(out, strings.setdefault(value, len(strings)))
+        case list():
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for v in value:
+                _pack(v, out, strings)
+        case dict():
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for k, v in value.items():
+                _write_varint(out, strings.setdefault(k, len(strings)))
+                _pack(v, out, strings)
+        case _:
+            msg = f">>>ERROR: cannot pack value of type {type(value).__name__}"
+            raise TypeError(msg)
+
+
+def _unpack(data: bytes, pos: int, strings: list[str]) -> tuple[Any, int]:
+    tag = data[pos]
+    pos = pos + 1
+    match tag:
+        case 0:
+            return None, pos
+        case 1:
+            return False, pos
+        case 2:
+            return True, pos
+        case 3:
+            i, pos = _read_varint(data, pos)
+            return strings[i], pos
+        case 4:
+            n, pos = _read_varint(data, pos)
+            items: list[Any] = []
+            for _ in range(n):
+                v, pos = _unpack(data, pos, strings)
+                items.append(v)
+            return items, pos
+        case 5:
+            n, pos = _read_varint(data, pos)
+            node: dict[str, Any] = {}
+            for _ in range(n):
+                k, pos = _read_varint(data, pos)
+                node[strings[k]], pos = _unpack(data, pos, strings)
+            return node, pos
+        case 6:
+            n, pos = _read_varint(data, pos)
+            return (n >> 1) ^ -(n & 1), pos
+        case _:
+            msg = f">>>ERROR: corrupt IR, unknown tag {tag} at byte {pos - 1}"
+            raise ValueError(msg)
+
+
+def dumps_binary(header: CPPHeader) -> bytes:
+    strings: dict[str, int] = {}
+    body = bytearray()
+    _pack(to_dict(header), body, strings)
+    out = bytearray(_MAGIC)
+    _write_varint(out, len(strings))
+    for s in strings:
+        encoded = s.encode()
+        _write_varint(out, len(encoded))
+        out.extend(encoded)
+    return bytes(out + body)
+
+
+def loads_binary(data: bytes) -> CPPHeader:
+    if not data.startswith(_MAGIC):
+        msg = ">>>ERROR: data is not a binary hpp2cythonparser IR"
+        raise ValueError(msg)
+    try:
+        n, pos = _read_varint(data, len(_MAGIC))
+        strings: list[str] = []
+        for _ in range(n):
+            size, pos = _read_varint(data, pos)
+            strings.append(data[pos : pos + size].decode())
+            pos = pos + size
+        value, _ = _unpack(data, pos, strings)
+    except IndexError as e:
+        msg = ">>>ERROR: binary IR is truncated"
+        raise ValueError(msg) from e
+    return from_dict(value)
+
+
+def save_ir(header: CPPHeader, name: Path | str) -> None:
+    """Write ``header`` as JSON if ``name`` ends in .json, otherwise as binary."""
+    name = Path(name)
+    if name.suffix == ".json":
+        name.write_text(dumps_json(header))
+    else:
+        name.write_bytes(dumps_binary(header))
+
+
+def load_ir(name: Path | str) -> CPPHeader:
+    name = Path(name)
+    if name.suffix == ".json":
+        return loads_json(name.read_text())
+    return loads_binary(name.read_bytes())
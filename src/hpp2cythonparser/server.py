@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+__all__ = ["HeaderCache", "handle_request", "serve"]
+import dataclasses as dc
+import hashlib
+import json
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from pytools.logging.api import NULL_LOGGER
+
+from ._internals.core import (
+    InputInfo,
+    find_includes_from_file,
+    find_includes_from_lines,
+    get_input_info,
+    parse_cppheader_lines,
+)
+from ._internals.emitters import PxdEmitter
+from ._internals.tools import clean_cpplines, log_lazy, read_cppfile
+from .struct import BindingOptions, CPPHeader
+
+if TYPE_CHECKING:
+    from pytools.logging.trait import ILogger
+
+    from .struct import CPPClass, CPPFunction, CPPVar
+
+    _Content: TypeAlias = list[CPPVar | CPPFunction | CPPClass]
+
+
+def _stamp(name: Path) -> int:
+    return name.stat().st_mtime_ns
+
+
+def _file_key(name: Path | str) -> Path:
+    return Path(name).resolve()
+
+
+def _text_key(name: Path | str) -> str:
+    return f"text:{Path(name)}"
+
+
+@dc.dataclass(slots=True)
+class HeaderCache:
+    """Parsed headers and include lists, keyed by resolved path and invalidated on mtime."""
+
+    log: ILogger = NULL_LOGGER
+    _ir: dict[Path | str, tuple[int | str, str | None, _Content]] = dc.field(
+        default_factory=dict,
+    )
+    _includes: dict[tuple[Path, str, Path, bool], tuple[int, list[str]]] = dc.field(
+        default_factory=dict,
+    )
+    _lock: threading.Lock = dc.field(default_factory=threading.Lock)
+
+    def parse_file(self, name: Path) -> tuple[str | None, _Content]:
+        key = _file_key(name)
+        stamp = _stamp(key)
+        with self._lock:
+            cached = self._ir.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        namespace, content = parse_cppheader_lines(read_cppfile(key), self.log)
+        with self._lock:
+            self._ir[key] = (stamp, namespace, content)
+        return namespace, content
+
+    def parse_text(self, name: Path | str, code: list[str]) -> tuple[str | None, _Content]:
+        key = _text_key(name)
+        digest = hashlib.blake2b("\n".join(code).encode()).hexdigest()
+        with self._lock:
+            cached = self._ir.get(key)
+        if cached is not None and cached[0] == digest:
+            return cached[1], cached[2]
+        namespace, content = parse_cppheader_lines(code, self.log)
+        with self._lock:
+            self._ir[key] = (digest, namespace, content)
+        return namespace, content
+
+    def includes(
+        self,
+        name: Path,
+        header: str,
+        folder: Path,
+        *,
+        preamble_only: bool = False,
+    ) -> list[str]:
+        name = _file_key(name)
+        key = (name, header, folder, preamble_only)
+        stamp = _stamp(name)
+        with self._lock:
+            cached = self._includes.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        includes = find_includes_from_file(name, header, folder, preamble_only=preamble_only)
+        with self._lock:
+            self._includes[key] = (stamp, includes)
+        return includes
+
+    def invalidate(self, name: Path | str | None = None) -> None:
+        with self._lock:
+            if name is None:
+                self._ir.clear()
+                self._includes.clear()
+                return
+            path = _file_key(name)
+            self._ir.pop(path, None)
+            self._ir.pop(_text_key(name), None)
+            for key in [k for k in self._includes if k[0] == path]:
+                del self._includes[key]
+
+
+def _binding_options(request: dict[str, Any]) -> BindingOptions:
+    return BindingOptions(
+        show_content=request.get("show_content", True),
+        nogil=request.get("nogil", False),
+        noexcept=request.get("noexcept", False),
+    )
+
+
+def _convert_file(cache: HeaderCache, request: dict[str, Any]) -> dict[str, Any]:
+    inp = get_input_info(
+        request["file"],
+        cache.log,
+        request.get("cpp_home"),
+        request.get("cython_home"),
+    )
+    includes_cpp = (
+        cache.includes(inp.cpp_file, inp.hpp_file.name, inp.cython_folder, preamble_only=True)
+        if inp.cpp_file.is_file()
+        else []
+    )
+    includes_hpp = cache.includes(inp.hpp_file, inp.hpp_file.name, inp.cython_folder)
+    includes = sorted(set(includes_cpp + includes_hpp))
+    namespace, content = cache.parse_file(inp.hpp_file)
+    text = PxdEmitter().render(
+        inp,
+        CPPHeader(namespace, includes, content),
+        _binding_options(request),
+    )
+    inp.cython_file.parent.mkdir(parents=True, exist_ok=True)
+    inp.cython_file.write_text(text)
+    response: dict[str, Any] = {"ok": True, "cython_file": str(inp.cython_file)}
+    if request.get("return_text", False):
+        response["pxd"] = text
+    return response
+
+
+def _convert_text(cache: HeaderCache, request: dict[str, Any]) -> dict[str, Any]:
+    hpp_file = Path(request.get("name", "buffer.hpp"))
+    inp = InputInfo(
+        hpp_file,
+        hpp_file.with_suffix(".cpp"),
+        hpp_file.with_suffix(".pxd"),
+        Path(),
+    )
+    code = clean_cpplines(request["text"].split("\n"))
+    includes = sorted(
+        set(find_includes_from_lines(code, hpp_file.name, request.get("folder", ""))),
+    )
+    namespace, content = cache.parse_text(hpp_file, code)
+    text = PxdEmitter().render(
+        inp,
+        CPPHeader(namespace, includes, content),
+        _binding_options(request),
+    )
+    return {"ok": True, "pxd": text}
+
+
+def _invalidate(cache: HeaderCache, request: dict[str, Any]) -> dict[str, Any]:
+    cache.invalidate(request.get("path"))
+    return {"ok": True}
+
+
+_HANDLERS = {
+    "convert_file": _convert_file,
+    "convert_text": _convert_text,
+    "invalidate": _invalidate,
+}
+
+
+_STRING_FIELDS = ("op", "file", "cpp_home", "cython_home", "text", "name", "folder", "path")
+_BOOL_FIELDS = ("return_text", "show_content", "nogil", "noexcept")
+
+
+def _check_request(request: object) -> dict[str, Any]:
+    if not isinstance(request, dict):
+        msg = f">>>ERROR: request must be a JSON object, got {type(request).__name__}"
+        raise ValueError(msg)
+    for fields, kind in ((_STRING_FIELDS, str), (_BOOL_FIELDS, bool)):
+        for field in fields:
+            if request.get(field) is not None and not isinstance(request[field], kind):
+                msg = f">>>ERROR: request field {field} must be a {kind.__name__}"
+                raise ValueError(msg)
+    return request
+
+
+def handle_request(cache: HeaderCache, line: bytes | str) -> dict[str, Any]:
+    try:
+        request = _check_request(json.loads(line))
+        handler = _HANDLERS.get(request.get("op"))
+        if handler is None:
+            return {"ok": False, "error": f"unknown op {request.get('op')!r}"}
+        return handler(cache, request)
+    except Exception as e:  # noqa: BLE001  a bad request must not drop the connection
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _HeaderServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = handle_request(self.server.cache, line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _HeaderServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, address: str, cache: HeaderCache) -> None:
+        super().__init__(address, _RequestHandler)
+        self.cache = cache
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    if socket_path.is_socket():
+        socket_path.unlink()
+    elif socket_path.exists() or socket_path.is_symlink():
+        msg = f">>>ERROR: {socket_path} exists and is not a socket"
+        raise ValueError(msg)
+
+
+def serve(socket_path: Path | str, log: ILogger = NULL_LOGGER) -> None:
+    """Serve newline delimited JSON requests on a Unix domain socket.
+
+    Each request is an object with an ``op`` of ``convert_file`` (``file``,
+    optional ``cpp_home``, ``cython_home``, ``return_text``), ``convert_text``
+    (``text``, optional ``name``, ``folder``) or ``invalidate`` (optional
+    ``path``, all entries if omitted). Both conversions also accept
+    ``show_content``, ``nogil`` and ``noexcept``. Each response is a JSON
+    object with ``ok`` and either the result or ``error``.
+    """
+    socket_path = Path(socket_path)
+    _remove_stale_socket(socket_path)
+    with _HeaderServer(str(socket_path), HeaderCache(log)) as server:
+        log_lazy(log, "info", lambda: f"Serving on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            _remove_stale_socket(socket_path)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
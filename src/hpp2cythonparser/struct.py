@@ -1,13 +1,24 @@
 from __future__ import annotations
 
-__all__ = ["CPPClass", "CPPFunction", "CPPVar"]
+__all__ = [
+    "AnnotationRule",
+    "BindingOptions",
+    "CPPClass",
+    "CPPFunction",
+    "CPPHeader",
+    "CPPVar",
+    "MemoryviewRule",
+]
 import dataclasses as dc
+import fnmatch
 import textwrap
 from typing import TYPE_CHECKING
 
 from ._c_types import c_constructor
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from .trait import Ctype, CtypeExtended
 
 
@@ -29,6 +40,10 @@ class CPPFunction:
     name: str
     content: list[CPPVar] = dc.field(default_factory=list[CPPVar])
     _subelem: bool = False
+    noexcept: bool = False
+    nogil: bool = False
+    const: bool = False
+    pure: bool = False
 
     def __str__(self) -> str:
         wrapper = textwrap.TextWrapper(
@@ -43,6 +58,13 @@ class CPPFunction:
             string = "cdef " + string
         if isinstance(self.kind, c_constructor):
             string = string + "$except$+"
+        elif self.noexcept:
+            string = string + "$noexcept"
+        if self.nogil:
+            string = string + "$nogil"
+        # Cython only accepts the method qualifier after the exception and gil clauses
+        if self.const:
+            string = string + "$const"
         return "\n".join(wrapper.wrap(text=string)).replace("$", " ")
 
 
@@ -50,13 +72,111 @@ class CPPFunction:
 class CPPClass:
     name: str
     content: list[CPPFunction | CPPVar] = dc.field(default_factory=list[CPPFunction | CPPVar])
+    abstract: bool = False
+    declares_constructor: bool = False
 
     def __str__(self) -> str:
         head = f"  cdef cppclass {self.name}:"
-        string = ""
-        if self.content:
-            for el in self.content:
-                string = string + "\n" + str(el)
-        else:
-            string = string + "\n  pass"
-        return head + string.replace("\n", "\n  ")
+        body = [str(el) for el in self.content] if self.content else ["  pass"]
+        return "\n".join([head, *body]).replace("\n", "\n  ")
+
+
+@dc.dataclass(slots=True)
+class CPPHeader:
+    namespace: str | None
+    includes: list[str] = dc.field(default_factory=list[str])
+    content: list[CPPVar | CPPFunction | CPPClass] = dc.field(
+        default_factory=list[CPPVar | CPPFunction | CPPClass],
+    )
+
+
+@dc.dataclass(slots=True, frozen=True)
+class MemoryviewRule:
+    """Typed memoryview used for array arguments matching ``pattern``.
+
+    ``pattern`` is a glob over the qualified argument name, e.g. ``solve.x``
+    or ``Solver.step.state``; the first matching rule wins. A non-contiguous
+    view is copied to a C-contiguous buffer before its pointer is passed on.
+    """
+
+    pattern: str = "*"
+    ndim: int = 1
+    contiguous: bool = True
+
+    def __post_init__(self) -> None:
+        if self.ndim < 1:
+            msg = f">>>ERROR: memoryview rule {self.pattern} needs ndim >= 1, got {self.ndim}"
+            raise ValueError(msg)
+
+    def matches(self, name: str) -> bool:
+        return fnmatch.fnmatchcase(name, self.pattern)
+
+    def spec(self) -> str:
+        dims = [":"] * self.ndim
+        if self.contiguous:
+            dims[-1] = "::1"
+        return f"[{', '.join(dims)}]"
+
+    def first_element(self, name: str) -> str:
+        return f"&{name}[{', '.join(['0'] * self.ndim)}]"
+
+    def is_empty(self, name: str) -> str:
+        return " or ".join(f"{name}.shape[{i}] == 0" for i in range(self.ndim))
+
+
+@dc.dataclass(slots=True, frozen=True)
+class AnnotationRule:
+    """Override ``nogil``/``noexcept`` for functions whose qualified name matches ``pattern``.
+
+    Functions are named ``func`` or ``Class.method``; ``None`` keeps the current value.
+    ``noexcept=False`` does not apply to functions declared ``noexcept`` in C++.
+    """
+
+    pattern: str
+    nogil: bool | None = None
+    noexcept: bool | None = None
+
+    def matches(self, name: str) -> bool:
+        return fnmatch.fnmatchcase(name, self.pattern)
+
+
+@dc.dataclass(slots=True)
+class BindingOptions:
+    show_content: bool = True
+    memoryviews: Sequence[MemoryviewRule] = (MemoryviewRule(),)
+    nogil: bool = False
+    noexcept: bool = False
+    annotations: Sequence[AnnotationRule] = ()
+
+    def memoryview_for(self, name: str) -> MemoryviewRule | None:
+        return next((r for r in self.memoryviews if r.matches(name)), None)
+
+    def annotate(self, fn: CPPFunction, name: str) -> CPPFunction:
+        """Copy of ``fn`` with the run defaults and matching rules applied, in order."""
+        nogil, noexcept = self.nogil, self.noexcept
+        for rule in self.annotations:
+            if rule.matches(name):
+                nogil = nogil if rule.nogil is None else rule.nogil
+                noexcept = noexcept if rule.noexcept is None else rule.noexcept
+        return dc.replace(fn, nogil=nogil, noexcept=noexcept or fn.noexcept)
+
+    def annotate_content(
+        self,
+        content: list[CPPVar | CPPFunction | CPPClass],
+    ) -> list[CPPVar | CPPFunction | CPPClass]:
+        annotated: list[CPPVar | CPPFunction | CPPClass] = []
+        for item in content:
+            match item:
+                case CPPFunction():
+                    annotated.append(self.annotate(item, item.name))
+                case CPPClass():
+                    members = [
+                        self.annotate(m, f"{item.name}.{m.name}")
+                        if isinstance(m, CPPFunction)
+                        else m
+                        for m in item.content
+                    ]
+                    annotated.append(dc.replace(item, content=members))
+                case _:
+                    annotated.append(item)
+        return annotated
@@ -5,9 +5,17 @@ __all__ = [
     "CPPObject",
     "Ctype",
     "CtypeExtended",
+    "Emitter",
 ]
 import abc
 import enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from ._internals.core import InputInfo
+    from .struct import BindingOptions, CPPHeader
 
 
 class CPPObject(enum.Enum):
@@ -40,3 +48,13 @@ class Ctype(CtypeExtended):
     @abc.abstractmethod
     def __str__(self) -> str:
         """Convert the C type to a string representation."""
+
+
+class Emitter(abc.ABC):
+    @abc.abstractmethod
+    def output(self, inp: InputInfo) -> Path:
+        """Path of the file written for the header described by ``inp``."""
+
+    @abc.abstractmethod
+    def render(self, inp: InputInfo, header: CPPHeader, options: BindingOptions) -> str:
+        """Render the parsed header to the text of the output file."""
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from hpp2cythonparser.api import BindingOptions, create_cython_header
+
+
+@pytest.fixture
+def header(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    name = tmp_path / "solver.hpp"
+    name.write_text("double step(int n);\n")
+    return name
+
+
+@pytest.mark.parametrize(
+    ("show_content", "options", "shown"),
+    [
+        (None, None, True),
+        (None, BindingOptions(show_content=False), False),
+        (False, None, False),
+        (True, BindingOptions(show_content=False), True),
+    ],
+)
+def test_show_content_overrides_options_only_when_given(
+    header: Path,
+    show_content: bool | None,
+    options: BindingOptions | None,
+    shown: bool,
+) -> None:
+    create_cython_header(header, show_content=show_content, options=options)
+    pxd = Path("solver.pxd").read_text()
+    assert ("double step(int n)" in pxd) is shown
+    assert ("  pass" in pxd) is not shown
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+from pytools.logging.api import NULL_LOGGER
+
+from hpp2cythonparser._internals.core import InputInfo, parse_cppheader_code
+from hpp2cythonparser._internals.emitters import PyiEmitter, PyxEmitter
+from hpp2cythonparser.struct import BindingOptions, CPPHeader, MemoryviewRule
+
+_INP = InputInfo(Path("g.hpp"), Path("g.cpp"), Path("g.pxd"), Path())
+
+
+def _render(
+    emitter: PyxEmitter | PyiEmitter,
+    code: str,
+    options: BindingOptions | None = None,
+) -> str:
+    header = CPPHeader("geo", [], parse_cppheader_code(code, NULL_LOGGER))
+    return emitter.render(_INP, header, options or BindingOptions())
+
+
+def test_class_without_constructor_is_default_constructed() -> None:
+    pyx = _render(PyxEmitter(), "class Plain { public: int id() const; };")
+    assert "self._ptr = new _cpp.Plain()" in pyx
+
+
+def test_unwrapped_constructor_raises() -> None:
+    pyx = _render(
+        PyxEmitter(),
+        "class Grid { public: Grid(const std::vector<double>& v); double total() const; };",
+    )
+    assert "new _cpp.Grid" not in pyx
+    assert 'raise TypeError("Grid cannot be constructed from Python")' in pyx
+
+
+def test_abstract_class_is_not_constructed() -> None:
+    code = "class Shape { public: Shape(int n); virtual double area() const = 0; };"
+    pyx = _render(PyxEmitter(), code)
+    assert "new _cpp.Shape" not in pyx
+    assert 'raise TypeError("Shape cannot be constructed from Python")' in pyx
+    assert "__init__" not in _render(PyiEmitter(), code)
+
+
+def test_deleted_constructor_suppresses_default() -> None:
+    code = "class NoCopy { public: NoCopy(const NoCopy& o) = delete; int id() const; };"
+    assert "new _cpp.NoCopy" not in _render(PyxEmitter(), code)
+    assert "__init__" not in _render(PyiEmitter(), code)
+
+
+def test_wrapped_constructor() -> None:
+    code = "class Box { public: Box(int n); };"
+    assert "self._ptr = new _cpp.Box(n)" in _render(PyxEmitter(), code)
+    assert "def __init__(self, n: int) -> None: ..." in _render(PyiEmitter(), code)
+
+
+def test_contiguous_memoryview_passes_first_element() -> None:
+    pyx = _render(PyxEmitter(), "void scale(double* x, int n);")
+    assert (
+        "def scale(double[::1] x, int n):\n"
+        "    _cpp.scale(<double*>NULL if x.shape[0] == 0 else &x[0], n)\n"
+    ) in pyx
+
+
+def test_empty_matrix_is_passed_as_null() -> None:
+    options = BindingOptions(memoryviews=(MemoryviewRule(ndim=2),))
+    pyx = _render(PyxEmitter(), "void solve(const double* mat, int n);", options)
+    assert (
+        "_cpp.solve(<const double*>NULL if mat.shape[0] == 0 or mat.shape[1] == 0 "
+        "else &mat[0, 0], n)"
+    ) in pyx
+
+
+def test_strided_memoryview_is_copied() -> None:
+    options = BindingOptions(memoryviews=(MemoryviewRule(contiguous=False),))
+    pyx = _render(PyxEmitter(), "double dot(const double* x, double* y, int n);", options)
+    assert pyx.endswith(
+        """\
+def dot(const double[:] x, double[:] y, int n):
+    cdef const double[::1] _x = None if x.shape[0] == 0 else x.copy()
+    cdef double[::1] _y = None if y.shape[0] == 0 else y.copy()
+    cdef double _r
+    _r = _cpp.dot(<const double*>NULL if x.shape[0] == 0 else &_x[0], \
+<double*>NULL if y.shape[0] == 0 else &_y[0], n)
+    if _y is not None:
+        y[...] = _y
+    return _r
+""",
+    )
+
+
+_OVERLOADS = """\
+class Grid {
+public:
+  Grid(const std::vector<double>& v);
+  Grid(int n);
+  double at(const std::vector<int>& i);
+  double at(int i);
+};
+"""
+
+
+def test_first_wrappable_overload_is_used() -> None:
+    pyx = _render(PyxEmitter(), _OVERLOADS)
+    assert "    def __cinit__(self, int n):\n        self._ptr = new _cpp.Grid(n)\n" in pyx
+    assert "    def at(self, int i):\n        return self._ptr.at(i)\n" in pyx
+    assert "not wrapped" not in pyx
+    pyi = _render(PyiEmitter(), _OVERLOADS)
+    assert "def __init__(self, n: int) -> None: ..." in pyi
+    assert "def at(self, i: int) -> float: ..." in pyi
+
+
+def test_class_arguments_reject_none() -> None:
+    code = "class Vec { public: Vec(int n); int take(const Vec& o); }; int size(Vec a);"
+    pyx = _render(PyxEmitter(), code)
+    assert "def take(self, Vec o not None):\n        return self._ptr.take(o._ptr[0])\n" in pyx
+    assert "def size(Vec a not None):\n    return _cpp.size(a._ptr[0])\n" in pyx
+
+
+def test_class_pointer_arguments_map_none_to_null() -> None:
+    code = "class Vec { public: Vec(int n); int peek(Vec* o); };"
+    assert "self._ptr.peek(<_cpp.Vec*>NULL if o is None else o._ptr)" in _render(PyxEmitter(), code)
+    assert "def peek(self, o: Vec | None) -> int: ..." in _render(PyiEmitter(), code)
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+from pytools.logging.api import NULL_LOGGER
+
+from hpp2cythonparser._c_types import c_generic_t
+from hpp2cythonparser._internals import core
+from hpp2cythonparser.api import create_cython_bindings
+from hpp2cythonparser.struct import CPPClass, CPPFunction, CPPVar
+
+_HEADER = """\
+#include <vector>
+namespace geo {
+class Box {
+public:
+  Box(int n);
+  double volume(double* x) const;
+  int n;
+};
+double measure(Box* b, std::vector<double>& v);
+void skipped(std::function<void()> f);
+}
+"""
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.messages: list[object] = []
+
+    def _record(self, *msg: object) -> None:
+        self.messages.extend(msg)
+
+    info = warn = error = debug = _record
+
+
+def _forbid(*_: object) -> str:
+    msg = "formatted a log message on a NULL_LOGGER run"
+    raise AssertionError(msg)
+
+
+def test_null_logger_formats_nothing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(core, "pformat", _forbid)
+    for cls in (CPPVar, CPPFunction, CPPClass, c_generic_t):
+        monkeypatch.setattr(cls, "__repr__", _forbid)
+    hpp = tmp_path / "geo.hpp"
+    hpp.write_text(_HEADER)
+    written = create_cython_bindings(hpp, tmp_path, tmp_path / "out", log=NULL_LOGGER)
+    assert len(written) == 3
+
+
+def test_active_logger_gets_the_content(tmp_path: Path) -> None:
+    hpp = tmp_path / "geo.hpp"
+    hpp.write_text(_HEADER)
+    log = _Recorder()
+    core.parse_cppheader(core.get_input_info(hpp, log), log)  # type: ignore[arg-type]
+    assert any("CPPClass(name='Box'" in str(m) for m in log.messages)
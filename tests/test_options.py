@@ -0,0 +1,41 @@
+import pytest
+
+from hpp2cythonparser._c_types import c_double
+from hpp2cythonparser.struct import AnnotationRule, BindingOptions, CPPFunction, MemoryviewRule
+
+
+def test_rules_apply_in_order() -> None:
+    options = BindingOptions(
+        nogil=True,
+        annotations=(
+            AnnotationRule("Solver.*", nogil=False),
+            AnnotationRule("Solver.run", nogil=True),
+        ),
+    )
+    fn = CPPFunction(c_double(), "step")
+    assert options.annotate(fn, "step").nogil
+    assert not options.annotate(fn, "Solver.step").nogil
+    assert options.annotate(fn, "Solver.run").nogil
+
+
+def test_rule_cannot_clear_cpp_noexcept() -> None:
+    options = BindingOptions(annotations=(AnnotationRule("*", noexcept=False),))
+    assert options.annotate(CPPFunction(c_double(), "step", noexcept=True), "step").noexcept
+    assert not options.annotate(CPPFunction(c_double(), "step"), "step").noexcept
+
+
+def test_rule_can_clear_run_default_noexcept() -> None:
+    options = BindingOptions(noexcept=True, annotations=(AnnotationRule("step", noexcept=False),))
+    assert not options.annotate(CPPFunction(c_double(), "step"), "step").noexcept
+
+
+@pytest.mark.parametrize("ndim", [0, -1])
+def test_memoryview_rule_needs_a_dimension(ndim: int) -> None:
+    with pytest.raises(ValueError, match="ndim >= 1"):
+        MemoryviewRule(ndim=ndim)
+
+
+def test_memoryview_rule_spec() -> None:
+    assert MemoryviewRule().spec() == "[::1]"
+    assert MemoryviewRule(ndim=2).spec() == "[:, ::1]"
+    assert MemoryviewRule(ndim=2, contiguous=False).spec() == "[:, :]"
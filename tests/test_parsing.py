@@ -0,0 +1,133 @@
+import pytest
+from pytools.logging.api import NULL_LOGGER
+
+from hpp2cythonparser._internals.core import parse_cppheader_code
+from hpp2cythonparser._internals.file_parsing import get_classmembers_public
+from hpp2cythonparser._internals.tools import split_statements
+from hpp2cythonparser.struct import CPPClass, CPPFunction
+
+
+def _members(code: str) -> list[str]:
+    (cls,) = parse_cppheader_code(code, NULL_LOGGER)
+    assert isinstance(cls, CPPClass)
+    return [str(m).strip() for m in cls.content]
+
+
+def test_brace_init_nested_in_parentheses() -> None:
+    code = "A(int x) : v_(std::vector<int>{1,2}) { go(); } int k;"
+    assert list(split_statements(code)) == [
+        "A(int x) : v_(std::vector<int>{1,2}) { go(); }",
+        "int k;",
+    ]
+
+
+def test_brace_init_in_initializer_list() -> None:
+    code = "A(int x) : a_{x}, b_{2} { go(); } int k;"
+    assert list(split_statements(code)) == ["A(int x) : a_{x}, b_{2} { go(); }", "int k;"]
+
+
+def test_constructor_with_nested_brace_init() -> None:
+    code = "class A { public: A(int x) : v_(std::vector<int>{1,2}) { go(); } int k; };"
+    assert _members(code) == ["A(int x) except +", "int k"]
+
+
+def test_deleted_functions_are_dropped() -> None:
+    code = "class A { public: A(); A(const A& o) = delete; void f() = delete; int g() = default; };"
+    assert _members(code) == ["A() except +", "int g()"]
+
+
+def test_pure_virtual_marks_class_abstract() -> None:
+    (cls,) = parse_cppheader_code(
+        "class Shape { public: virtual double area() const = 0; int n; };",
+        NULL_LOGGER,
+    )
+    assert isinstance(cls, CPPClass)
+    assert cls.abstract
+    area = cls.content[0]
+    assert isinstance(area, CPPFunction)
+    assert area.pure
+
+
+def test_private_pure_virtual_marks_class_abstract() -> None:
+    (cls,) = parse_cppheader_code(
+        "class Shape { public: double area(); private: virtual void f() = 0; };",
+        NULL_LOGGER,
+    )
+    assert isinstance(cls, CPPClass)
+    assert cls.abstract
+
+
+def test_assignment_in_body_is_not_pure() -> None:
+    (cls,) = parse_cppheader_code(
+        "class A { public: void f() { if (x) y = 0; } };",
+        NULL_LOGGER,
+    )
+    assert isinstance(cls, CPPClass)
+    assert not cls.abstract
+
+
+def test_access_labels_only_at_top_level() -> None:
+    code = "public: int count() const { return private_count + 1; } private: int private_count;"
+    assert get_classmembers_public(code) == "int count() const { return private_count + 1; }"
+
+
+def test_later_public_sections_are_kept() -> None:
+    code = (
+        "class A { public: int count() const { return private_count; }"
+        " private: int private_count; public: int k; };"
+    )
+    assert _members(code) == ["int count() const", "int k"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        'return "}{";',
+        'return "};{";',
+        'return "\\"}";',
+        "return '}';",
+        "return '{';",
+        "return '\\'';",
+    ],
+)
+def test_braces_in_literals(body: str) -> None:
+    code = f"inline const char* tag() {{ {body} }} int k;"
+    assert list(split_statements(code)) == [f"inline const char* tag() {{ {body} }}", "int k;"]
+    assert [str(c).strip() for c in parse_cppheader_code(code, NULL_LOGGER)] == [
+        "cdef const char* tag()",
+        "cdef int k",
+    ]
+
+
+def test_deeply_nested_body() -> None:
+    body = "if (a) { " * 200 + "run();" + " }" * 200
+    code = f"void deep() {{ {body} }} int after(int n);"
+    assert [str(c).strip() for c in parse_cppheader_code(code, NULL_LOGGER)] == [
+        "cdef void deep()",
+        "cdef int after(int n)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "inline double twice(double x) { return 2 * x; }",
+        "constexpr double twice(double x) { return 2 * x; }",
+        "inline constexpr double twice(double x) { return 2 * x; }",
+    ],
+)
+def test_inline_and_constexpr_functions_are_recorded(code: str) -> None:
+    (fn,) = parse_cppheader_code(code, NULL_LOGGER)
+    assert isinstance(fn, CPPFunction)
+    assert str(fn).strip() == "cdef double twice(double x)"
+
+
+def test_inline_method_with_nested_body() -> None:
+    code = """\
+class A {
+public:
+  inline int f() const { if (a) { for (;;) { while (b) { {} } } } return "}"[0]; }
+  int g(int n);
+};
+"""
+    assert _members(code) == ["int f() const", "int g(int n)"]
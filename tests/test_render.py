@@ -0,0 +1,29 @@
+from hpp2cythonparser._c_types import c_constructor, c_double, c_int
+from hpp2cythonparser.struct import CPPFunction, CPPVar
+
+
+def _method(**qualifiers: bool) -> CPPFunction:
+    args = [CPPVar(c_int(), "n", _subelem=True)]
+    return CPPFunction(c_double(), "step", args, _subelem=True, **qualifiers)
+
+
+def test_const_method() -> None:
+    assert str(_method(const=True)).strip() == "double step(int n) const"
+
+
+def test_const_follows_noexcept() -> None:
+    assert str(_method(const=True, noexcept=True)).strip() == "double step(int n) noexcept const"
+
+
+def test_const_follows_nogil() -> None:
+    assert str(_method(const=True, nogil=True)).strip() == "double step(int n) nogil const"
+
+
+def test_const_follows_noexcept_nogil() -> None:
+    fn = _method(const=True, noexcept=True, nogil=True)
+    assert str(fn).strip() == "double step(int n) noexcept nogil const"
+
+
+def test_constructor_is_except_plus() -> None:
+    fn = CPPFunction(c_constructor(), "Grid", [CPPVar(c_int(), "n", _subelem=True)], True)
+    assert str(fn).strip() == "Grid(int n) except +"
@@ -0,0 +1,116 @@
+"""Runtime growth of each parsing stage on generated headers of 1x, 10x and 100x size.
+
+The growth exponent is fitted on a log-log scale and must stay within a margin
+of the exponent of ``n log n`` over the same sizes; a quadratic stage fits ~2.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from pytools.logging.api import NULL_LOGGER
+
+from hpp2cythonparser._c_types import c_double, c_int
+from hpp2cythonparser._internals.core import parse_cppheader_code
+from hpp2cythonparser._internals.tools import (
+    Braces,
+    get_context,
+    remove_comment,
+    split_statements,
+)
+from hpp2cythonparser.struct import CPPClass, CPPFunction, CPPVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_UNIT = 40
+_SCALES = (1, 10, 100)
+_REPEATS = 5
+_MARGIN = 0.3
+
+
+def _header_lines(n: int) -> list[str]:
+    lines: list[str] = []
+    for i in range(n):
+        lines.extend(
+            [
+                f"/* block comment {i} */",
+                f"double f{i}(double* x, int n); /* trailing */",
+                f"class C{i} {{",
+                "public:",
+                f"  C{i}(int n) : n_(n) {{ if (n) {{ n_ = n; }} }}",
+                "  int get() const { return n_; }",
+                "  double y[3];",
+                "private:",
+                "  int n_;",
+                "};",
+            ],
+        )
+    return lines
+
+
+def _class(n: int) -> CPPClass:
+    members: list[CPPFunction | CPPVar] = []
+    for i in range(n):
+        members.append(CPPVar(c_int(), f"v{i}", _subelem=True))
+        args = [CPPVar(c_double(), "x", _subelem=True)]
+        members.append(CPPFunction(c_double(), f"m{i}", args, _subelem=True))
+    return CPPClass("Big", members)
+
+
+def _best_time(fn: Callable[[], object]) -> float:
+    best = math.inf
+    for _ in range(_REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _slope(xs: list[float], ys: list[float]) -> float:
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys, strict=True)) / sum(
+        (x - mx) ** 2 for x in xs
+    )
+
+
+def _growth(make: Callable[[int], object], run: Callable[[object], object]) -> float:
+    sizes = [_UNIT * s for s in _SCALES]
+    times = []
+    for n in sizes:
+        data = make(n)
+        times.append(_best_time(lambda data=data: run(data)))
+    return _slope([math.log(n) for n in sizes], [math.log(t) for t in times])
+
+
+def _nlogn_exponent() -> float:
+    sizes = [_UNIT * s for s in _SCALES]
+    return _slope([math.log(n) for n in sizes], [math.log(n * math.log(n)) for n in sizes])
+
+
+_STAGES: dict[str, tuple[Callable[[int], object], Callable[[object], object]]] = {
+    "remove_comment": (_header_lines, remove_comment),
+    "split_statements": (
+        lambda n: remove_comment(_header_lines(n)),
+        lambda code: list(split_statements(code)),
+    ),
+    "parse_cppheader_code": (
+        lambda n: remove_comment(_header_lines(n)),
+        lambda code: parse_cppheader_code(code, NULL_LOGGER),
+    ),
+    "get_context": (
+        lambda n: "namespace ns {" + remove_comment(_header_lines(n)) + "} int tail;",
+        lambda code: get_context(code, Braces.curly),
+    ),
+    "CPPClass.__str__": (_class, str),
+}
+
+
+@pytest.mark.parametrize("stage", list(_STAGES))
+def test_stage_growth_is_at_most_nlogn(stage: str) -> None:
+    make, run = _STAGES[stage]
+    exponent = _growth(make, run)
+    assert exponent <= _nlogn_exponent() + _MARGIN, f"{stage} grows as n^{exponent:.2f}"
@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+
+import pytest
+from pytools.logging.api import NULL_LOGGER
+
+from hpp2cythonparser._c_types import c_const, c_double, c_libcpp, c_ptr, c_ref
+from hpp2cythonparser._internals.core import parse_cppheader_code
+from hpp2cythonparser.serialize import (
+    SCHEMA,
+    SCHEMA_VERSION,
+    dumps_binary,
+    dumps_json,
+    from_dict,
+    load_ir,
+    loads_binary,
+    loads_json,
+    save_ir,
+    to_dict,
+)
+from hpp2cythonparser.struct import CPPClass, CPPFunction, CPPHeader, CPPVar
+
+_CODE = """\
+class Solver {
+public:
+  Solver(int n);
+  double step(const double* const x, std::vector<double>& out) const noexcept;
+  virtual void reset() = 0;
+  int n;
+};
+const std::map<int, std::string>& names();
+double scale(double* x, int n);
+double offset;
+"""
+
+
+@pytest.fixture
+def header() -> CPPHeader:
+    return CPPHeader("solver", ["src.base"], parse_cppheader_code(_CODE, NULL_LOGGER))
+
+
+def test_header_covers_the_node_types(header: CPPHeader) -> None:
+    solver, names, _, _ = header.content
+    assert isinstance(solver, CPPClass)
+    assert solver.abstract
+    step = solver.content[1]
+    assert isinstance(step, CPPFunction)
+    assert step.content[0] == CPPVar(c_ptr(c_const(c_double()), const=True), "x", _subelem=True)
+    assert isinstance(step.content[1].kind, c_ref)
+    assert isinstance(names, CPPFunction)
+    assert isinstance(names.kind, c_ref)
+    assert isinstance(names.kind.kind, c_const)
+    assert isinstance(names.kind.kind.kind, c_libcpp)
+
+
+def test_json_round_trip(header: CPPHeader) -> None:
+    assert loads_json(dumps_json(header)) == header
+    assert loads_json(dumps_json(header, indent=2)) == header
+
+
+def test_binary_round_trip(header: CPPHeader) -> None:
+    data = dumps_binary(header)
+    assert loads_binary(data) == header
+    assert len(data) < len(dumps_json(header))
+
+
+def test_defaults_are_omitted(header: CPPHeader) -> None:
+    (offset,) = to_dict(CPPHeader(None, [], header.content[-1:]))["content"]
+    assert offset == {"t": "CPPVar", "kind": {"t": "c_double"}, "name": "offset"}
+
+
+@pytest.mark.parametrize("suffix", [".json", ".ir", ""])
+def test_save_and_load_pick_format_from_suffix(
+    header: CPPHeader,
+    tmp_path: Path,
+    suffix: str,
+) -> None:
+    name = tmp_path / f"solver{suffix}"
+    save_ir(header, name)
+    if suffix == ".json":
+        assert json.loads(name.read_text())["schema"] == SCHEMA
+    else:
+        assert name.read_bytes().startswith(b"H2CIR")
+    assert load_ir(name) == header
+    assert load_ir(str(name)) == header
+
+
+@pytest.mark.parametrize(
+    ("field", "value", "error"),
+    [
+        ("schema", "other.ir", "not a hpp2cythonparser.ir document"),
+        ("version", SCHEMA_VERSION + 1, "IR version"),
+    ],
+)
+def test_wrong_schema_or_version_is_rejected(
+    header: CPPHeader,
+    field: str,
+    value: object,
+    error: str,
+) -> None:
+    data = to_dict(header)
+    data[field] = value
+    with pytest.raises(ValueError, match=error):
+        from_dict(data)
+    with pytest.raises(ValueError, match=error):
+        loads_json(json.dumps(data))
+
+
+def test_unknown_node_type_is_rejected(header: CPPHeader) -> None:
+    data = to_dict(header)
+    data["content"][0]["t"] = "os.system"
+    with pytest.raises(ValueError, match="unknown node type"):
+        from_dict(data)
+
+
+def test_truncated_binary_is_rejected(header: CPPHeader) -> None:
+    data = dumps_binary(header)
+    for end in range(len(data)):
+        with pytest.raises(ValueError):
+            loads_binary(data[:end])
+
+
+def test_corrupt_binary_is_rejected(header: CPPHeader) -> None:
+    with pytest.raises(ValueError, match="not a binary"):
+        loads_binary(b"JUNK" + dumps_binary(header))
+    # empty string table followed by an undefined tag
+    with pytest.raises(ValueError, match="unknown tag 99"):
+        loads_binary(b"H2CIR\x00\x63")
@@ -0,0 +1,115 @@
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from hpp2cythonparser.server import (
+    HeaderCache,
+    _HeaderServer,
+    _remove_stale_socket,
+    handle_request,
+    serve,
+)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "[1, 2]",
+        '"convert_file"',
+        "not json",
+        '{"op": 5}',
+        '{"op": "convert_file", "file": 123}',
+        '{"op": "convert_text", "text": ["int a;"]}',
+        '{"op": "convert_text", "text": "int a;", "nogil": "yes"}',
+        '{"op": "convert_file", "file": "missing.hpp"}',
+    ],
+)
+def test_bad_requests_are_errors(line: str) -> None:
+    response = handle_request(HeaderCache(), line)
+    assert response["ok"] is False
+    assert response["error"]
+
+
+def test_convert_text() -> None:
+    response = handle_request(HeaderCache(), '{"op": "convert_text", "text": "int f(int n);"}')
+    assert response["ok"] is True
+    assert "cdef int f(int n)" in response["pxd"]
+
+
+def _touch_later(name: Path) -> None:
+    stamp = name.stat().st_mtime_ns + 1_000_000_000
+    os.utime(name, ns=(stamp, stamp))
+
+
+def test_file_cache_hit_and_mtime_reparse(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    name = tmp_path / "solver.hpp"
+    name.write_text("int f(int n);\n")
+    cache = HeaderCache()
+    _, content = cache.parse_file(Path("solver.hpp"))
+    assert cache.parse_file(name)[1] is content
+    assert cache.parse_file(Path("./sub/../solver.hpp"))[1] is content
+    name.write_text("int g(int n);\n")
+    _touch_later(name)
+    _, changed = cache.parse_file(name)
+    assert changed is not content
+    assert changed[0].name == "g"
+
+
+def test_invalidate_matches_equivalent_names(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "solver.hpp").write_text("int f(int n);\n")
+    cache = HeaderCache()
+    _, content = cache.parse_file(Path("solver.hpp"))
+    cache.invalidate(str(tmp_path / "solver.hpp"))
+    assert cache.parse_file(Path("solver.hpp"))[1] is not content
+
+    _, text = cache.parse_text("a/b.hpp", ["int f(int n);"])
+    assert cache.parse_text(Path("a/b.hpp"), ["int f(int n);"])[1] is text
+    cache.invalidate("a/./b.hpp")
+    assert cache.parse_text("a/b.hpp", ["int f(int n);"])[1] is not text
+
+
+def test_connection_survives_bad_requests(tmp_path: Path) -> None:
+    path = str(tmp_path / "h.sock")
+    with _HeaderServer(path, HeaderCache()) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.socket(socket.AF_UNIX) as client:
+                client.connect(path)
+                stream = client.makefile("rwb")
+                for line in (b"[1, 2]\n", b'{"op": "convert_file", "file": 123}\n'):
+                    stream.write(line)
+                    stream.flush()
+                    assert json.loads(stream.readline())["ok"] is False
+                stream.write(b'{"op": "convert_text", "text": "int a;"}\n')
+                stream.flush()
+                assert json.loads(stream.readline())["ok"] is True
+        finally:
+            server.shutdown()
+
+
+def test_serve_refuses_to_replace_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(ValueError, match="is not a socket"):
+        serve(path)
+    assert path.read_text() == "keep me"
+
+
+def test_stale_socket_is_removed(tmp_path: Path) -> None:
+    path = tmp_path / "h.sock"
+    with socket.socket(socket.AF_UNIX) as stale:
+        stale.bind(str(path))
+    assert path.is_socket()
+    _remove_stale_socket(path)
+    assert not path.exists()
+    _remove_stale_socket(path)
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pytest
+
+from hpp2cythonparser._internals.tools import _strip_line_comment, read_cpp_preamble
+
+
+def _preamble(tmp_path: Path, code: str) -> list[str]:
+    name = tmp_path / "pre.hpp"
+    name.write_text(code)
+    return read_cpp_preamble(name)
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ('#include "a.hpp" // the base', ('#include "a.hpp"', False)),
+        ('#include "a.hpp" /* the base */', ('#include "a.hpp"', False)),
+        ('/* x */ #include "a.hpp" /* y */ // z', ('#include "a.hpp"', False)),
+        ('#include "a.hpp" /* starts here', ('#include "a.hpp"', True)),
+        ("// only a comment", ("", False)),
+    ],
+)
+def test_strip_line_comment(line: str, expected: tuple[str, bool]) -> None:
+    assert _strip_line_comment(line) == expected
+
+
+def test_block_comment_hides_include(tmp_path: Path) -> None:
+    code = """\
+#pragma once
+/* disabled:
+#include "old.hpp"
+*/ #include "new.hpp"
+/*
+ * int not_a_declaration;
+ */
+#include "last.hpp"
+"""
+    assert _preamble(tmp_path, code) == [
+        "#pragma once",
+        '#include "new.hpp"',
+        '#include "last.hpp"',
+    ]
+
+
+def test_comment_after_include(tmp_path: Path) -> None:
+    code = '#include "a.hpp" // pulls in Base\n#include <vector>  // std\n'
+    assert _preamble(tmp_path, code) == ['#include "a.hpp"', "#include <vector>"]
+
+
+def test_conditional_blocks_are_kept(tmp_path: Path) -> None:
+    code = """\
+#ifndef SOLVER_HPP
+#define SOLVER_HPP
+#ifdef USE_MPI
+#include "mpi_base.hpp"
+extern int rank;
+#endif
+#include "base.hpp"
+class Solver {};
+#endif
+"""
+    assert _preamble(tmp_path, code) == [
+        "#ifndef SOLVER_HPP",
+        "#define SOLVER_HPP",
+        "#ifdef USE_MPI",
+        '#include "mpi_base.hpp"',
+        "#endif",
+        '#include "base.hpp"',
+        "#endif",
+    ]
+
+
+def test_continued_define_is_skipped(tmp_path: Path) -> None:
+    code = """\
+#define SQUARE(x) \\
+  ((x) *      \\
+   (x))
+#include "a.hpp"
+"""
+    assert _preamble(tmp_path, code) == ["#define SQUARE(x) \\", '#include "a.hpp"']
+
+
+def test_stops_at_first_declaration(tmp_path: Path) -> None:
+    code = '#include "a.hpp"\nnamespace geo {\n#include "late.hpp"\n}\n'
+    assert _preamble(tmp_path, code) == ['#include "a.hpp"']
+
+
+def test_missing_file_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="does not exist"):
+        read_cpp_preamble(tmp_path / "missing.hpp")
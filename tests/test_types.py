@@ -0,0 +1,69 @@
+import pytest
+from pytools.logging.api import NULL_LOGGER
+
+from hpp2cythonparser._c_types import c_const, c_generic, c_libcpp, c_ref
+from hpp2cythonparser._internals.core import find_libcpp_imports, parse_cppheader_code
+from hpp2cythonparser._internals.ctype_parsing import get_variable_type
+
+_STRING = c_libcpp("string", "libcpp.string")
+
+
+@pytest.mark.parametrize(
+    ("code", "kind"),
+    [
+        ("const std::string& s", c_ref(c_const(_STRING))),
+        ("const std::string &s", c_ref(c_const(_STRING))),
+        ("std::string& s", c_ref(_STRING)),
+        ("Foo& f", c_ref(c_generic("Foo"))),
+        ("Foo&& f", c_ref(c_ref(c_generic("Foo")))),
+    ],
+)
+def test_reference_declarators(code: str, kind: object) -> None:
+    assert get_variable_type(code) == (kind, code.rsplit(None, 1)[-1].lstrip("&"))
+
+
+@pytest.mark.parametrize("arg", ["Foo&& f", "std::string&& s", "Foo &&f"])
+def test_rvalue_reference_args_are_dropped(arg: str) -> None:
+    assert parse_cppheader_code(f"void g({arg});", NULL_LOGGER) == []
+
+
+def test_reference_return_is_mapped() -> None:
+    content = parse_cppheader_code("std::string& name();", NULL_LOGGER)
+    assert str(content[0]).strip() == "cdef string& name()"
+    assert find_libcpp_imports(content) == ["from libcpp.string cimport string"]
+
+
+@pytest.mark.parametrize(
+    ("code", "pxd", "imports"),
+    [
+        ("void f(int64_t n);", "cdef void f(int64_t n)", ["from libc.stdint cimport int64_t"]),
+        ("int32_t h();", "cdef int32_t h()", ["from libc.stdint cimport int32_t"]),
+        (
+            "void g(const std::uint8_t* p);",
+            "cdef void g(const uint8_t* p)",
+            ["from libc.stdint cimport uint8_t"],
+        ),
+        ("void d(doublereal* x);", "cdef void d(doublereal* x)", []),
+        ("void i(int* x, double& y);", "cdef void i(int* x, double& y)", []),
+    ],
+)
+def test_builtin_prefixed_type_names(code: str, pxd: str, imports: list[str]) -> None:
+    content = parse_cppheader_code(code, NULL_LOGGER)
+    assert str(content[0]).strip() == pxd
+    assert find_libcpp_imports(content) == imports
+
+
+def test_builtin_prefixed_variables_are_not_split() -> None:
+    assert parse_cppheader_code("doublereal x; integer m;", NULL_LOGGER) == []
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "void i(std::vector<double>::iterator it);",
+        "void j(const std::map<int, double>::const_iterator& it);",
+        "std::vector<int>::size_type n();",
+    ],
+)
+def test_nested_names_of_templates_are_dropped(code: str) -> None:
+    assert parse_cppheader_code(code, NULL_LOGGER) == []